@@ -6,7 +6,7 @@ from .llm_client import (
     ToolCall,
     ToolDefinition,
 )
-from .factory import build_llm_client
+from .factory import build_llm_client, override_llm_client
 
 __all__ = [
     "ChatMessage",
@@ -16,4 +16,5 @@ __all__ = [
     "ToolCall",
     "ToolDefinition",
     "build_llm_client",
+    "override_llm_client",
 ]
@@ -1,27 +1,42 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 
+_CONTEXT_BLOCK_PATTERN = re.compile(
+    r"<context>(.*?)</context>", re.IGNORECASE | re.DOTALL
+)
 
-def extract_context_value(message: str, key: str) -> str | None:
-    if not isinstance(message, str) or not isinstance(key, str):
-        return None
 
-    match = re.search(r"<context>(.*?)</context>", message, re.IGNORECASE | re.DOTALL)
+@lru_cache(maxsize=8)
+def _context_values(message: str) -> Mapping[str, str]:
+    """Parse every ``key=value`` line of the ``<context>`` block in one pass.
+
+    Cached so the engine's back-to-back extractor calls on the same message
+    share a single parse; the result is read-only because it is shared.
+    """
+    match = _CONTEXT_BLOCK_PATTERN.search(message)
     if match is None:
-        return None
+        return MappingProxyType({})
 
-    key_prefix = f"{key.lower()}="
-    context_block = match.group(1)
-    for raw_line in context_block.splitlines():
+    values: dict[str, str] = {}
+    for raw_line in match.group(1).splitlines():
         line = raw_line.strip()
         if line.startswith("-"):
             line = line[1:].strip()
-        if not line.lower().startswith(key_prefix):
-            continue
-        return line.split("=", 1)[1].strip()
+        key, sep, value = line.partition("=")
+        if sep:
+            values.setdefault(key.lower(), value.strip())
+    return MappingProxyType(values)
 
-    return None
+
+def extract_context_value(message: str, key: str) -> str | None:
+    if not isinstance(message, str) or not isinstance(key, str):
+        return None
+
+    return _context_values(message).get(key.lower())
 
 
 def extract_selected_external_aliases(message: str) -> list[str] | None:
@@ -1,12 +1,33 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from chat.adapters.openai_adapter import OpenAiAdapter
 from chat.adapters.openrouter_adapter import OpenRouterAdapter
 from chat.llm_client import LlmClient
 from env_loader import load_env_once
 
+_llm_client_override: ContextVar[LlmClient | None] = ContextVar(
+    "llm_client_override", default=None
+)
+
+
+@contextmanager
+def override_llm_client(client: LlmClient) -> Iterator[LlmClient]:
+    """Make ``build_llm_client`` return ``client`` within the current context.
+
+    Tasks created while the override is active inherit it, so background
+    turns started from the same context see the same client.
+    """
+    token = _llm_client_override.set(client)
+    try:
+        yield client
+    finally:
+        _llm_client_override.reset(token)
+
 
 def build_llm_client(
     *,
@@ -14,6 +35,10 @@ def build_llm_client(
     model: str | None = None,
     api_key: str | None = None,
 ) -> LlmClient:
+    override = _llm_client_override.get()
+    if override is not None:
+        return override
+
     load_env_once()
 
     resolved_provider = (
@@ -148,6 +148,7 @@ class ChatJobScheduler:
         self._start_lock = asyncio.Lock()
         self._tasks: dict[str, asyncio.Task[None]] = {}
         self._tasks_lock = asyncio.Lock()
+        self._finished_events: dict[str, set[asyncio.Event]] = {}
 
     async def start(self) -> None:
         async with self._start_lock:
@@ -195,6 +196,29 @@ class ChatJobScheduler:
         await self.start()
         await self._schedule_without_start(job_id)
 
+    def subscribe(self, job_id: str) -> asyncio.Event:
+        """Return an event set when this scheduler marks ``job_id`` completed or failed.
+
+        Re-check the stored status after subscribing: a job that already
+        finished will not set the event. Pair every call with
+        ``unsubscribe`` so abandoned waits do not accumulate.
+        """
+        event = asyncio.Event()
+        self._finished_events.setdefault(job_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, job_id: str, event: asyncio.Event) -> None:
+        events = self._finished_events.get(job_id)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            del self._finished_events[job_id]
+
+    def _notify_finished(self, job_id: str) -> None:
+        for event in self._finished_events.pop(job_id, ()):
+            event.set()
+
     async def _schedule_without_start(self, job_id: str) -> None:
         """Schedule a job task assuming the scheduler is already initialized."""
         if not self._started:
@@ -304,6 +328,7 @@ class ChatJobScheduler:
                 ),
             )
             conn.commit()
+        self._notify_finished(job_id)
 
     def _mark_failed(self, job_id: str, error: str) -> None:
         with get_conn() as conn:
@@ -319,6 +344,7 @@ class ChatJobScheduler:
                 (JOB_STATUS_FAILED, error[:4000], job_id),
             )
             conn.commit()
+        self._notify_finished(job_id)
 
     @staticmethod
     def _build_summary(events: list[dict[str, Any]]) -> dict[str, Any]:
@@ -34,7 +34,7 @@ class LlmResponse:
     raw: Any | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StreamChunk:
     """A single incremental piece from an LLM streaming response.
 
@@ -523,8 +523,8 @@ async def spawn_subagents_blocking(
         source_worldline_id,
     )
 
-    child_runs: list[dict[str, Any]] = []
-    accepted_tasks: list[dict[str, Any]] = []
+    prepared_tasks: list[tuple[int, str, str]] = []
+    branch_options: list[BranchOptions] = []
     for idx, task in enumerate(resolved_tasks):
         task_message = str(task.get("message") or "").strip()
         if not task_message:
@@ -538,9 +538,17 @@ async def spawn_subagents_blocking(
             task_label = "anchor"
         branch_name_raw = str(task.get("branch_name") or "").strip()
         branch_name = branch_name_raw or f"subagent-{idx + 1}"
-        ordering_key = f"{fanout_group_id}:{idx}"
 
-        branch = worldline_service.branch_from_event(
+        prepared_message = task_message
+        if tasks_derived and idx == anchor_index:
+            prepared_message = _build_anchor_task_message(
+                original_message=task_message,
+                goal=goal,
+                tasks=resolved_tasks,
+            )
+
+        prepared_tasks.append((idx, task_label, prepared_message))
+        branch_options.append(
             BranchOptions(
                 source_worldline_id=source_worldline_id,
                 from_event_id=from_event_id,
@@ -550,14 +558,13 @@ async def spawn_subagents_blocking(
             )
         )
 
-        prepared_message = task_message
-        if tasks_derived and idx == anchor_index:
-            prepared_message = _build_anchor_task_message(
-                original_message=task_message,
-                goal=goal,
-                tasks=resolved_tasks,
-            )
+    # All child worldlines are created in one transaction.
+    branches = worldline_service.branch_many_from_event(branch_options)
 
+    child_runs: list[dict[str, Any]] = []
+    accepted_tasks: list[dict[str, Any]] = []
+    for (idx, task_label, prepared_message), branch in zip(prepared_tasks, branches):
+        ordering_key = f"{fanout_group_id}:{idx}"
         child_runs.append(
             {
                 "task_index": idx,
@@ -121,7 +121,8 @@ def new_id(prefix: str) -> str:
 @contextmanager
 def get_conn() -> Iterator[sqlite3.Connection]:
     DB_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, timeout=30)
+    # ``file:`` URIs (e.g. shared-cache in-memory DBs in tests) need uri=True.
+    conn = sqlite3.connect(DB_PATH, timeout=30, uri=str(DB_PATH).startswith("file:"))
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA journal_mode = WAL;")
@@ -135,6 +136,10 @@ def get_conn() -> Iterator[sqlite3.Connection]:
 
 def init_meta_db() -> None:
     with get_conn() as conn:
+        # sqlite3 autocommits each DDL statement unless a transaction is open;
+        # open one (taking the write lock up front) so the whole schema and
+        # migration land in one commit.
+        conn.execute("BEGIN IMMEDIATE")
         for statement in SCHEMA_STATEMENTS:
             conn.execute(statement)
         _ensure_chat_turn_jobs_columns(conn)
@@ -1,127 +1,303 @@
 import asyncio
+import contextvars
 import json
+import re
+import sqlite3
 import tempfile
 import unittest
+from collections import deque
+from collections.abc import Iterable
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
-import time
 
 import api.chat as chat_api
 import chat.engine as chat_engine
 import meta
+import services.chat_runtime as chat_runtime
 import api.threads as threads
 import api.worldlines as worldlines
-import services.chat_runtime as chat_runtime
+from chat.factory import override_llm_client
 from chat.llm_client import LlmResponse, StreamChunk, ToolCall
 from fastapi.responses import StreamingResponse
 
+try:
+    import uvloop
+except ModuleNotFoundError:
+    uvloop = None
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(value: object) -> str:
+    # Only used for ASCII seed payloads, where orjson's UTF-8 output matches
+    # ``ensure_ascii=True``.
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, ensure_ascii=True)
+
+
+_SSE_DATA_RE = re.compile(rb"^data: (.*)$", re.MULTILINE)
+
+# Size of each ``tool_call_delta`` fragment replayed by ``FakeLlmClient``.
+_ARGS_DELTA_WINDOW = 64
+
+_SEED_PAYLOAD_JSON = _dumps({"text": "seed"})
+_RUNNING_JOB_REQUEST_JSON = _dumps({"message": "running"})
+# Prior python call/result pair seeded by the duplicate-artifact test.
+_PREV_PY_CALL_JSON = _dumps(
+    {"code": "print('seed')", "timeout": 30, "call_id": "call_prev_py"}
+)
+_PREV_PY_RESULT_JSON = _dumps(
+    {
+        "error": None,
+        "artifacts": [
+            {
+                "type": "csv",
+                "name": "top_by_amount.csv",
+                "artifact_id": "artifact_prev_top_by_amount",
+            }
+        ],
+    }
+)
+_TERMINAL_STATUSES: frozenset[str] = frozenset({"completed", "failed"})
+
+# Expected event-type sequences shared by several chat turn assertions.
+_PLAIN_TURN_EVENT_TYPES = ("user_message", "assistant_message")
+_SQL_TURN_EVENT_TYPES = (
+    "user_message",
+    "tool_call_sql",
+    "tool_result_sql",
+    "assistant_message",
+)
+_MANY_SQL_TURN_EVENT_TYPES = (
+    "user_message",
+    *("tool_call_sql", "tool_result_sql") * 4,
+    "assistant_message",
+)
+_SUBAGENTS_TURN_EVENT_TYPES = (
+    "user_message",
+    "tool_call_subagents",
+    "tool_result_subagents",
+    "assistant_message",
+)
+
+
+def _sql_tool_call(call_id: str, *, limit: int = 10) -> ToolCall:
+    """Build the ``SELECT 1 AS x`` ``run_sql`` call most tool-loop tests use."""
+    return ToolCall(
+        id=call_id,
+        name="run_sql",
+        arguments={"sql": "SELECT 1 AS x", "limit": limit},
+    )
+
 
 class FakeLlmClient:
     """Test double that supports both ``generate()`` and ``generate_stream()``."""
 
-    def __init__(self, responses: list[LlmResponse]) -> None:
-        self._responses = list(responses)
+    def __init__(
+        self, responses: Iterable[LlmResponse], text_chunk_size: int = 64
+    ) -> None:
+        # Each response is queued with its tool-call argument JSON, encoded once
+        # here rather than on every replay.
+        self._responses = deque(
+            (
+                response,
+                [
+                    json.dumps(tc.arguments, ensure_ascii=True)
+                    for tc in response.tool_calls
+                ],
+            )
+            for response in responses
+        )
+        self.text_chunk_size = text_chunk_size
         self.calls = 0
 
     async def generate(self, **kwargs) -> LlmResponse:
         self.calls += 1
         if not self._responses:
             raise AssertionError("No fake responses left for LLM generate()")
-        return self._responses.pop(0)
+        response, _ = self._responses.popleft()
+        return response
 
     async def generate_stream(self, **kwargs):
         """Yield ``StreamChunk`` objects that reconstruct the next response.
 
         This simulates a real streaming adapter by breaking the pre-built
         ``LlmResponse`` into the chunk protocol the engine expects:
-          - text -> individual character StreamChunks (type="text")
-          - tool_calls -> start / delta (full args JSON) / done sequence
+          - text -> StreamChunks of ``text_chunk_size`` characters (type="text")
+          - tool_calls -> start / deltas (args JSON in fixed windows) / done sequence
         """
         self.calls += 1
         if not self._responses:
             raise AssertionError("No fake responses left for LLM generate_stream()")
-        response = self._responses.pop(0)
+        response, tool_args_json = self._responses.popleft()
 
-        # Stream text tokens (one per char for fine-grained fidelity)
+        # Stream text in fixed-size slices; pass text_chunk_size=1 for per-char
         if response.text:
-            for ch in response.text:
-                yield StreamChunk(type="text", text=ch)
+            text = response.text
+            step = self.text_chunk_size
+            for start in range(0, len(text), step):
+                yield StreamChunk(type="text", text=text[start : start + step])
 
         # Stream tool calls
-        for tc in response.tool_calls:
+        for tc, args_json in zip(response.tool_calls, tool_args_json):
             yield StreamChunk(
                 type="tool_call_start",
                 tool_call_id=tc.id,
                 tool_name=tc.name,
             )
-            args_json = json.dumps(tc.arguments, ensure_ascii=True)
-            yield StreamChunk(
-                type="tool_call_delta",
-                tool_call_id=tc.id,
-                arguments_delta=args_json,
-            )
+            for start in range(0, len(args_json), _ARGS_DELTA_WINDOW):
+                yield StreamChunk(
+                    type="tool_call_delta",
+                    tool_call_id=tc.id,
+                    arguments_delta=args_json[start : start + _ARGS_DELTA_WINDOW],
+                )
             yield StreamChunk(
                 type="tool_call_done",
                 tool_call_id=tc.id,
             )
 
 
-class ChatApiTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.temp_dir = tempfile.TemporaryDirectory()
-        temp_root = Path(self.temp_dir.name)
+# Four ``run_sql`` turns (``SELECT n AS x`` with ``limit=n``) and a final answer.
+_MANY_SQL_RESPONSES = (
+    *(
+        LlmResponse(
+            text=None,
+            tool_calls=[
+                ToolCall(
+                    id=f"call_many_{n}",
+                    name="run_sql",
+                    arguments={"sql": f"SELECT {n} AS x", "limit": n},
+                )
+            ],
+        )
+        for n in range(1, 5)
+    ),
+    LlmResponse(text="Here are the results from all four queries.", tool_calls=[]),
+)
+
+
+def _client(*turns: tuple[str | None, Iterable[ToolCall]]) -> FakeLlmClient:
+    """Build a ``FakeLlmClient`` from ``(text, tool_calls)`` turns."""
+    return FakeLlmClient(
+        responses=[
+            LlmResponse(text=text, tool_calls=list(tool_calls))
+            for text, tool_calls in turns
+        ]
+    )
 
-        meta.DB_DIR = temp_root / "data"
-        meta.DB_PATH = meta.DB_DIR / "meta.db"
+
+class ChatApiTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._runner = asyncio.Runner(
+            loop_factory=uvloop.new_event_loop if uvloop is not None else None
+        )
+        # One migrated DB per class; setUp empties the tables instead of
+        # re-creating the schema for every test. The DB lives in a shared-cache
+        # in-memory SQLite held open by ``_keepalive``; the temp directory is
+        # still needed because workspaces and DuckDB files live under DB_DIR.
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._db_dir = Path(cls._temp_dir.name) / "data"
+        cls._db_path = f"file:chat_api_tests_{id(cls)}?mode=memory&cache=shared"
+        cls._keepalive = sqlite3.connect(cls._db_path, uri=True)
+        meta.DB_DIR = cls._db_dir
+        meta.DB_PATH = cls._db_path
         meta.init_meta_db()
+        with meta.get_conn() as conn:
+            cls._tables = [
+                row["name"]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master"
+                    " WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                    " AND name != 'threads'"
+                )
+            ]
+        # Tests only use the thread as a parent for their worldlines, so one
+        # thread survives the per-test wipe and is shared by every test.
+        cls._thread_id = cls._runner.run(
+            threads.create_thread(threads.CreateThreadRequest(title="chat-test-thread"))
+        )["thread_id"]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._runner.close()
+        cls._keepalive.close()
+        cls._temp_dir.cleanup()
+
+    def setUp(self) -> None:
+        meta.DB_DIR = self._db_dir
+        meta.DB_PATH = self._db_path
+        with meta.get_conn() as conn:
+            conn.execute("PRAGMA foreign_keys = OFF;")
+            for table in self._tables:
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM threads WHERE id != ?", (self._thread_id,))
+            conn.commit()
 
     def tearDown(self) -> None:
-        self.temp_dir.cleanup()
+        # Tasks left behind by this test (job workers, stream producers) would
+        # otherwise keep running against the tables the next setUp empties.
+        self._run(self._cancel_pending_tasks())
+
+    @staticmethod
+    async def _cancel_pending_tasks() -> None:
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     def _run(self, coro):
-        return asyncio.run(coro)
+        # Runner.run defaults to the runner's own context; copy the caller's so
+        # ``override_llm_client`` set around ``_run`` reaches the coroutine.
+        return self._runner.run(coro, context=contextvars.copy_context())
 
-    async def _consume_stream(self, response: StreamingResponse) -> str:
-        chunks: list[str] = []
+    async def _consume_stream(self, response: StreamingResponse) -> bytes:
+        buf = bytearray()
         async for chunk in response.body_iterator:
-            if isinstance(chunk, bytes):
-                chunks.append(chunk.decode("utf-8"))
-            else:
-                chunks.append(str(chunk))
-        return "".join(chunks)
-
-    def _extract_sse_payloads(self, raw_stream: str) -> list[dict]:
-        payloads: list[dict] = []
-        for frame in raw_stream.split("\n\n"):
-            frame = frame.strip()
-            if not frame:
-                continue
-            data_lines: list[str] = []
-            for line in frame.splitlines():
-                if line.startswith("data: "):
-                    data_lines.append(line[len("data: ") :])
-            if data_lines:
-                payloads.append(json.loads("\n".join(data_lines)))
-        return payloads
-
-    async def _consume_stream_first_n(self, response: StreamingResponse, n: int) -> str:
-        chunks: list[str] = []
-        count = 0
+            buf.extend(
+                chunk if isinstance(chunk, (bytes, bytearray)) else chunk.encode("utf-8")
+            )
+        return bytes(buf)
+
+    def _extract_event_types(self, payloads: list[dict]) -> list[str]:
+        """Persisted event types in stream order."""
+        return [payload["event"]["type"] for payload in payloads if "event" in payload]
+
+    async def _call_and_drain(
+        self, request: chat_api.ChatRequest
+    ) -> tuple[StreamingResponse, bytes]:
+        """Open ``chat_stream`` and read it to the end in one loop round-trip."""
+        response = await chat_api.chat_stream(request)
+        return response, await self._consume_stream(response)
+
+    async def _iter_sse_payloads(self, response: StreamingResponse):
+        """Yield decoded SSE payloads as each frame arrives."""
         async for chunk in response.body_iterator:
-            if isinstance(chunk, bytes):
-                chunks.append(chunk.decode("utf-8"))
-            else:
-                chunks.append(str(chunk))
-            count += 1
-            if count >= n:
-                break
-        return "".join(chunks)
+            if not isinstance(chunk, (bytes, bytearray)):
+                chunk = chunk.encode("utf-8")
+            for data in _SSE_DATA_RE.findall(chunk):
+                yield _loads(data)
 
-    def _create_thread(self, title: str = "chat-test-thread") -> str:
-        response = self._run(
-            threads.create_thread(threads.CreateThreadRequest(title=title))
-        )
-        return response["thread_id"]
+    def _extract_sse_payloads(self, raw_stream: bytes) -> list[dict]:
+        # Every frame from ``api.chat`` carries exactly one ``data:`` line.
+        return [_loads(data) for data in _SSE_DATA_RE.findall(raw_stream)]
+
+    async def _consume_stream_first_n(self, response: StreamingResponse, n: int) -> bytes:
+        chunks: list[bytes] = []
+        async for chunk in response.body_iterator:
+            chunks.append(
+                chunk if isinstance(chunk, (bytes, bytearray)) else chunk.encode("utf-8")
+            )
+            if len(chunks) >= n:
+                break
+        return b"".join(chunks)
 
     def _create_worldline(self, thread_id: str, name: str = "main") -> str:
         response = self._run(
@@ -131,46 +307,103 @@ class ChatApiTests(unittest.TestCase):
         )
         return response["worldline_id"]
 
+    def _seed_events(
+        self,
+        worldline_id: str,
+        events: list[tuple[str, str | None, str, str]],
+    ) -> None:
+        """Insert ``(id, parent_event_id, type, payload_json)`` rows and move the
+        worldline head to the last one, all in a single transaction."""
+        with meta.get_conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (event_id, worldline_id, parent_event_id, event_type, payload_json)
+                    for event_id, parent_event_id, event_type, payload_json in events
+                ],
+            )
+            conn.execute(
+                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
+                (events[-1][0], worldline_id),
+            )
+            conn.commit()
+
+    def _seed_head_event(self, worldline_id: str, event_id: str) -> None:
+        self._seed_events(
+            worldline_id,
+            [(event_id, None, "assistant_message", _SEED_PAYLOAD_JSON)],
+        )
+
     async def _wait_for_job_status(
         self,
         job_id: str,
         *,
-        expected: set[str],
+        expected: frozenset[str],
         timeout_s: float = 2.0,
     ) -> dict:
-        deadline = time.monotonic() + timeout_s
-        while time.monotonic() < deadline:
+        scheduler = chat_runtime.get_chat_job_scheduler()
+        finished = scheduler.subscribe(job_id)
+        try:
             job = await chat_api.get_chat_job(job_id)
-            if job["status"] in expected:
-                return job
-            await asyncio.sleep(0.03)
+            if job["status"] not in expected:
+                try:
+                    async with asyncio.timeout(timeout_s):
+                        await finished.wait()
+                except TimeoutError:
+                    pass
+                job = await chat_api.get_chat_job(job_id)
+        finally:
+            scheduler.unsubscribe(job_id, finished)
+
+        if job["status"] in expected:
+            return job
         raise AssertionError(f"job {job_id} did not reach expected statuses {expected}")
 
+    async def _await_event_type(
+        self,
+        worldline_id: str,
+        wanted_type: str,
+        *,
+        timeout_s: float = 2.0,
+        poll_s: float = 0.02,
+    ) -> list[dict]:
+        events: list[dict] = []
+        try:
+            async with asyncio.timeout(timeout_s):
+                while True:
+                    events = (
+                        await worldlines.get_worldline_events(worldline_id, limit=100)
+                    )["events"]
+                    if any(event["type"] == wanted_type for event in events):
+                        return events
+                    await asyncio.sleep(poll_s)
+        except TimeoutError:
+            pass
+        return events
+
     # ---- non-streaming endpoint tests (unchanged logic) ---------------------
 
     def test_chat_appends_user_and_assistant_events(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Hello back!", tool_calls=[])]
-        )
+        fake_client = _client(("Hello back!", ()))
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="hello",
-                        provider="openrouter",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="hello",
+            provider="openrouter",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 1)
         self.assertEqual(result["worldline_id"], worldline_id)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
         self.assertEqual(result["events"][0]["payload"], {"text": "hello"})
         self.assertEqual(result["events"][1]["payload"]["text"], "Hello back!")
@@ -187,14 +420,12 @@ class ChatApiTests(unittest.TestCase):
             ).fetchone()
 
         self.assertEqual(head_event["type"], "assistant_message")
-        self.assertEqual(json.loads(head_event["payload_json"])["text"], "Hello back!")
+        self.assertEqual(_loads(head_event["payload_json"])["text"], "Hello back!")
 
     def test_chat_report_mode_auto_generates_pdf_artifact(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Analysis complete.", tool_calls=[])]
-        )
+        fake_client = _client(("Analysis complete.", ()))
         fake_execute_python_tool = AsyncMock(
             return_value={
                 "stdout": "Generated report.pdf\n",
@@ -212,27 +443,24 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message=(
+                "summarize revenue\n\n"
+                "<context>\n"
+                "- output_type=report\n"
+                "</context>"
+            ),
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.execute_python_tool",
                 fake_execute_python_tool,
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message=(
-                            "summarize revenue\n\n"
-                            "<context>\n"
-                            "- output_type=report\n"
-                            "</context>"
-                        ),
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 1)
         self.assertEqual(fake_execute_python_tool.await_count, 1)
@@ -255,11 +483,9 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_dashboard_mode_does_not_auto_generate_pdf(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Dashboard complete.", tool_calls=[])]
-        )
+        fake_client = _client(("Dashboard complete.", ()))
         fake_execute_python_tool = AsyncMock(
             return_value={
                 "stdout": "Generated report.pdf\n",
@@ -277,27 +503,24 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message=(
+                "summarize revenue\n\n"
+                "<context>\n"
+                "- output_type=dashboard\n"
+                "</context>"
+            ),
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.execute_python_tool",
                 fake_execute_python_tool,
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message=(
-                            "summarize revenue\n\n"
-                            "<context>\n"
-                            "- output_type=dashboard\n"
-                            "</context>"
-                        ),
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 1)
         self.assertEqual(fake_execute_python_tool.await_count, 0)
@@ -308,46 +531,31 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_tool_loop_calls_sql_then_returns_final_message(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_1")],
                 ),
                 LlmResponse(text="The query returned one row.", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run a quick check",
-                        provider="openai",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run a quick check",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertEqual(result["worldline_id"], worldline_id)
-        event_types = [event["type"] for event in result["events"]]
         self.assertEqual(
-            event_types,
-            [
-                "user_message",
-                "tool_call_sql",
-                "tool_result_sql",
-                "assistant_message",
-            ],
+            tuple(event["type"] for event in result["events"]),
+            _SQL_TURN_EVENT_TYPES,
         )
 
         sql_result = next(
@@ -360,49 +568,34 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_skips_repeated_identical_tool_calls_in_turn_and_continues(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_repeat_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_repeat_1")],
                 ),
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_repeat_2",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_repeat_2")],
                 ),
                 LlmResponse(text="Used prior result without rerunning.", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run this once",
-                        provider="openrouter",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run this once",
+            provider="openrouter",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 3)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "tool_call_sql", "tool_result_sql", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _SQL_TURN_EVENT_TYPES,
         )
         self.assertEqual(
             result["events"][-1]["payload"]["text"],
@@ -412,72 +605,54 @@ class ChatApiTests(unittest.TestCase):
     def test_chat_skips_recent_identical_successful_tool_call_across_turns(
         self,
     ) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
 
         first_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_seed_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_seed_sql")],
                 ),
                 LlmResponse(text="seeded", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=first_client):
-            first_result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run once",
-                        provider="openrouter",
-                    )
-                )
-            )
+        first_request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run once",
+            provider="openrouter",
+        )
+        with override_llm_client(first_client):
+            first_result = self._run(chat_api.chat(first_request))
 
         self.assertEqual(first_client.calls, 2)
         self.assertEqual(
-            [event["type"] for event in first_result["events"]],
-            ["user_message", "tool_call_sql", "tool_result_sql", "assistant_message"],
+            tuple(event["type"] for event in first_result["events"]),
+            _SQL_TURN_EVENT_TYPES,
         )
 
         second_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_repeat_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_repeat_sql")],
                 )
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=second_client):
-            second_result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="continue analysis",
-                        provider="openrouter",
-                    )
-                )
-            )
+        second_request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="continue analysis",
+            provider="openrouter",
+        )
+        with override_llm_client(second_client):
+            second_result = self._run(chat_api.chat(second_request))
 
         self.assertEqual(second_client.calls, 1)
         self.assertEqual(
-            [event["type"] for event in second_result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in second_result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
         self.assertIn(
             "rerun",
@@ -485,91 +660,63 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_allows_recent_identical_call_when_user_requests_retry(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
 
         first_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_seed_retry_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_seed_retry_sql")],
                 ),
                 LlmResponse(text="seeded", tool_calls=[]),
             ]
         )
-        with patch.object(chat_api, "build_llm_client", return_value=first_client):
-            self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run once",
-                        provider="openrouter",
-                    )
-                )
-            )
+
+        first_request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run once",
+            provider="openrouter",
+        )
+        with override_llm_client(first_client):
+            self._run(chat_api.chat(first_request))
 
         second_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_retry_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_retry_sql")],
                 ),
                 LlmResponse(text="rerun done", tool_calls=[]),
             ]
         )
-        with patch.object(chat_api, "build_llm_client", return_value=second_client):
-            second_result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="try again",
-                        provider="openrouter",
-                    )
-                )
-            )
+
+        second_request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="try again",
+            provider="openrouter",
+        )
+        with override_llm_client(second_client):
+            second_result = self._run(chat_api.chat(second_request))
 
         self.assertEqual(second_client.calls, 2)
         self.assertEqual(
-            [event["type"] for event in second_result["events"]],
-            ["user_message", "tool_call_sql", "tool_result_sql", "assistant_message"],
+            tuple(event["type"] for event in second_result["events"]),
+            _SQL_TURN_EVENT_TYPES,
         )
 
     def test_chat_report_mode_skips_fallback_after_guard_stop(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_guard_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 1},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_guard_1", limit=1)],
                 ),
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_guard_2",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 1},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_guard_2", limit=1)],
                 ),
             ]
         )
@@ -590,24 +737,21 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message=(
+                "analyze the table\n\n"
+                "<context>\n"
+                "- output_type=report\n"
+                "</context>"
+            ),
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message=(
-                            "analyze the table\n\n"
-                            "<context>\n"
-                            "- output_type=report\n"
-                            "</context>"
-                        ),
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertEqual(fake_execute_python_tool.await_count, 0)
@@ -621,58 +765,26 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_prevents_duplicate_artifact_names_from_python(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
 
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
+        self._seed_events(
+            worldline_id,
+            [
                 (
                     "event_prev_py_call",
-                    worldline_id,
                     None,
                     "tool_call_python",
-                    json.dumps(
-                        {
-                            "code": "print('seed')",
-                            "timeout": 30,
-                            "call_id": "call_prev_py",
-                        }
-                    ),
+                    _PREV_PY_CALL_JSON,
                 ),
-            )
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
                 (
                     "event_prev_py_result",
-                    worldline_id,
                     "event_prev_py_call",
                     "tool_result_python",
-                    json.dumps(
-                        {
-                            "error": None,
-                            "artifacts": [
-                                {
-                                    "type": "csv",
-                                    "name": "top_by_amount.csv",
-                                    "artifact_id": "artifact_prev_top_by_amount",
-                                }
-                            ],
-                        }
-                    ),
+                    _PREV_PY_RESULT_JSON,
                 ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_prev_py_result", worldline_id),
-            )
-            conn.commit()
+            ],
+        )
 
         fake_client = FakeLlmClient(
             responses=[
@@ -702,25 +814,22 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="continue the duplicate analysis",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="continue the duplicate analysis",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 1)
         self.assertEqual(fake_execute_python_tool.await_count, 0)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
         self.assertIn(
             "would recreate existing artifacts",
@@ -728,7 +837,7 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_retries_once_after_empty_python_payload(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -769,25 +878,22 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run python",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run python",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 3)
         self.assertEqual(fake_execute_python_tool.await_count, 1)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
         self.assertEqual(
             result["events"][-1]["payload"]["text"],
@@ -795,7 +901,7 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_unwraps_json_wrapped_python_code_argument(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -826,19 +932,16 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="run wrapped python",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run wrapped python",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertEqual(fake_execute_python_tool.await_count, 1)
@@ -853,87 +956,26 @@ class ChatApiTests(unittest.TestCase):
 
     def test_chat_allows_many_sql_calls_per_turn(self) -> None:
         """No per-tool-call limit; multiple SQL runs complete and finalize."""
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[
-                LlmResponse(
-                    text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_many_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 1},
-                        )
-                    ],
-                ),
-                LlmResponse(
-                    text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_many_2",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 2 AS x", "limit": 2},
-                        )
-                    ],
-                ),
-                LlmResponse(
-                    text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_many_3",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 3 AS x", "limit": 3},
-                        )
-                    ],
-                ),
-                LlmResponse(
-                    text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_many_4",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 4 AS x", "limit": 4},
-                        )
-                    ],
-                ),
-                LlmResponse(
-                    text="Here are the results from all four queries.",
-                    tool_calls=[],
-                ),
-            ]
-        )
+        fake_client = FakeLlmClient(_MANY_SQL_RESPONSES)
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="keep running sql",
-                        provider="openai",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="keep running sql",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 5)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            [
-                "user_message",
-                "tool_call_sql",
-                "tool_result_sql",
-                "tool_call_sql",
-                "tool_result_sql",
-                "tool_call_sql",
-                "tool_result_sql",
-                "tool_call_sql",
-                "tool_result_sql",
-                "assistant_message",
-            ],
+            tuple(event["type"] for event in result["events"]),
+            _MANY_SQL_TURN_EVENT_TYPES,
         )
 
     def test_chat_allows_multiple_python_runs_per_turn(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -981,56 +1023,35 @@ class ChatApiTests(unittest.TestCase):
                 "execution_ms": 10,
             }
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="plot a line",
+            provider="openrouter",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.execute_python_tool",
                 side_effect=fake_execute_python_tool,
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="plot a line",
-                        provider="openrouter",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 3)
         self.assertEqual(run_count, 2)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
         self.assertEqual(
             result["events"][-1]["payload"]["text"], "Both python steps completed."
         )
 
     def test_chat_time_travel_branches_and_continues_on_new_worldline(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         source_worldline_id = self._create_worldline(thread_id)
 
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_branch",
-                    source_worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_branch", source_worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(source_worldline_id, "event_seed_branch")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -1054,27 +1075,18 @@ class ChatApiTests(unittest.TestCase):
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=source_worldline_id,
-                        message="please branch and continue",
-                        provider="openrouter",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=source_worldline_id,
+            message="please branch and continue",
+            provider="openrouter",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
-        event_types = [event["type"] for event in result["events"]]
         self.assertEqual(
-            event_types,
-            [
-                "worldline_created",
-                "time_travel",
-                "user_message",
-                "assistant_message",
-            ],
+            tuple(event["type"] for event in result["events"]),
+            ("worldline_created", "time_travel", "user_message", "assistant_message"),
         )
 
         created = result["events"][0]
@@ -1104,32 +1116,14 @@ class ChatApiTests(unittest.TestCase):
         self.assertEqual(new_worldline["name"], "alt-path")
         self.assertEqual(head_event["type"], "assistant_message")
         self.assertEqual(
-            json.loads(head_event["payload_json"])["text"],
+            _loads(head_event["payload_json"])["text"],
             "Now continuing in the branched worldline.",
         )
 
     def test_chat_spawn_subagents_tool_blocks_and_returns_aggregate(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_spawn",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_spawn", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_spawn")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -1197,8 +1191,13 @@ class ChatApiTests(unittest.TestCase):
             async def start(self) -> None:
                 return None
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="fan out",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.spawn_subagents_blocking",
                 AsyncMock(return_value=fake_spawn_result),
@@ -1208,26 +1207,13 @@ class ChatApiTests(unittest.TestCase):
                 return_value=_DummyScheduler(),
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="fan out",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertEqual(mocked_spawn.await_count, 1)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            [
-                "user_message",
-                "tool_call_subagents",
-                "tool_result_subagents",
-                "assistant_message",
-            ],
+            tuple(event["type"] for event in result["events"]),
+            _SUBAGENTS_TURN_EVENT_TYPES,
         )
         call_event = result["events"][1]
         self.assertEqual(call_event["payload"]["max_subagents"], 2)
@@ -1247,27 +1233,9 @@ class ChatApiTests(unittest.TestCase):
         self.assertEqual(result["events"][-1]["payload"]["text"], "Aggregated child runs.")
 
     def test_chat_spawn_subagents_persists_error_result_event(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_spawn_error",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_spawn_error", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_spawn_error")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -1295,8 +1263,13 @@ class ChatApiTests(unittest.TestCase):
                 _ = worldline_id
                 return await factory()
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="fan out and recover",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.spawn_subagents_blocking",
                 AsyncMock(side_effect=RuntimeError("simulated fanout failure")),
@@ -1306,24 +1279,11 @@ class ChatApiTests(unittest.TestCase):
                 return_value=_DummyCoordinator(),
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="fan out and recover",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            [
-                "user_message",
-                "tool_call_subagents",
-                "tool_result_subagents",
-                "assistant_message",
-            ],
+            tuple(event["type"] for event in result["events"]),
+            _SUBAGENTS_TURN_EVENT_TYPES,
         )
         tool_result = next(
             event for event in result["events"] if event["type"] == "tool_result_subagents"
@@ -1331,27 +1291,9 @@ class ChatApiTests(unittest.TestCase):
         self.assertIn("error", tool_result["payload"])
 
     def test_chat_spawn_subagents_partial_failure_adds_parent_synthesis_nudge(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_spawn_partial",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_spawn_partial", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_spawn_partial")
 
         class CaptureClient(FakeLlmClient):
             def __init__(self, responses: list[LlmResponse]) -> None:
@@ -1426,8 +1368,13 @@ class ChatApiTests(unittest.TestCase):
             async def start(self) -> None:
                 return None
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="fan out and synthesize despite failures",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.spawn_subagents_blocking",
                 AsyncMock(return_value=fake_spawn_result),
@@ -1437,15 +1384,7 @@ class ChatApiTests(unittest.TestCase):
                 return_value=_DummyScheduler(),
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="fan out and synthesize despite failures",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertGreaterEqual(len(fake_client.generate_call_history), 2)
@@ -1474,27 +1413,9 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_spawn_subagents_invalid_from_event_falls_back_to_head(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_spawn_fallback",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_spawn_fallback", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_spawn_fallback")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -1544,8 +1465,13 @@ class ChatApiTests(unittest.TestCase):
                 _ = worldline_id
                 return await factory()
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="fan out with stale event",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.spawn_subagents_blocking",
                 AsyncMock(return_value=fake_spawn_result),
@@ -1555,15 +1481,7 @@ class ChatApiTests(unittest.TestCase):
                 return_value=_DummyCoordinator(),
             ),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="fan out with stale event",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(result["events"][-1]["type"], "assistant_message")
         self.assertEqual(result["events"][-1]["payload"]["text"], "Fallback worked.")
@@ -1582,33 +1500,11 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_spawn_subagents_tool_is_blocked_in_subagent_child_turn(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_nested_guard",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_nested_guard", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_nested_guard")
 
-        engine = chat_engine.ChatEngine(
-            llm_client=FakeLlmClient(
-                responses=[LlmResponse(text="unused", tool_calls=[])]
-            )
-        )
+        engine = chat_engine.ChatEngine(llm_client=_client(("unused", ())))
         tool_call = ToolCall(
             id="call_nested",
             name="spawn_subagents",
@@ -1637,27 +1533,9 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_stream_emits_subagent_progress_deltas(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_progress",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_progress", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_progress")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -1751,23 +1629,19 @@ class ChatApiTests(unittest.TestCase):
                 ],
             }
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="fan out with progress",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch(
                 "chat.engine.spawn_subagents_blocking",
                 AsyncMock(side_effect=fake_spawn),
             ),
         ):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="fan out with progress",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
         progress_deltas = [
@@ -1783,35 +1657,44 @@ class ChatApiTests(unittest.TestCase):
     # ---- SSE streaming endpoint tests (updated for real streaming) ----------
 
     def test_chat_stream_returns_sse_event_frames(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Streaming hello.", tool_calls=[])]
-        )
-
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="stream this",
-                        provider="openrouter",
-                    )
-                )
-            )
-            self.assertIsInstance(response, StreamingResponse)
-            self.assertEqual(response.media_type, "text/event-stream")
-
-            raw_stream = self._run(self._consume_stream(response))
-            payloads = self._extract_sse_payloads(raw_stream)
-
-        event_payloads = [payload for payload in payloads if "event" in payload]
-        delta_payloads = [payload for payload in payloads if "delta" in payload]
+        fake_client = _client(("Streaming hello.", ()))
+
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="stream this",
+            provider="openrouter",
+        )
+
+        async def read_frames() -> tuple[StreamingResponse, list[dict]]:
+            response = await chat_api.chat_stream(request)
+            payloads: list[dict] = []
+            async for payload in self._iter_sse_payloads(response):
+                if not payloads:
+                    # Checked on arrival: the user message is flushed before
+                    # the turn runs, not buffered until the stream ends.
+                    self.assertEqual(payload["seq"], 1)
+                    self.assertEqual(payload["worldline_id"], worldline_id)
+                    self.assertEqual(payload["event"]["type"], "user_message")
+                    self.assertNotIn("done", payload)
+                payloads.append(payload)
+            return response, payloads
+
+        with override_llm_client(fake_client):
+            response, payloads = self._run(read_frames())
+        self.assertIsInstance(response, StreamingResponse)
+        self.assertEqual(response.media_type, "text/event-stream")
+
+        event_payloads: list[dict] = []
+        delta_payloads: list[dict] = []
+        for payload in payloads:
+            if "event" in payload:
+                event_payloads.append(payload)
+            if "delta" in payload:
+                delta_payloads.append(payload)
 
         self.assertGreaterEqual(len(event_payloads), 2)
-        self.assertEqual(event_payloads[0]["seq"], 1)
-        self.assertEqual(event_payloads[0]["worldline_id"], worldline_id)
-        self.assertEqual(event_payloads[0]["event"]["type"], "user_message")
         self.assertEqual(event_payloads[-1]["event"]["type"], "assistant_message")
         self.assertTrue(
             any(
@@ -1822,95 +1705,63 @@ class ChatApiTests(unittest.TestCase):
         self.assertTrue(payloads[-1]["done"])
 
     def test_chat_stream_emits_tool_call_and_tool_result(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_sse_sql_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_sse_sql_1")],
                 ),
                 LlmResponse(text="done", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="stream sql tool",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="stream sql tool",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
-        event_types = [
-            payload["event"]["type"] for payload in payloads if "event" in payload
-        ]
         self.assertEqual(
-            event_types,
-            ["user_message", "tool_call_sql", "tool_result_sql", "assistant_message"],
+            tuple(self._extract_event_types(payloads)),
+            _SQL_TURN_EVENT_TYPES,
         )
         self.assertTrue(payloads[-1]["done"])
 
     def test_chat_stream_emits_tool_call_skipped_for_repeated_call(self) -> None:
         """Repeated-call guard emits skipped delta and keeps turn alive."""
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_repeat_1",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_repeat_1")],
                 ),
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_repeat_2",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 10},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_repeat_2")],
                 ),
                 LlmResponse(text="used previous result", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="repeat this sql",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="repeat this sql",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
-        event_types = [
-            payload["event"]["type"] for payload in payloads if "event" in payload
-        ]
         self.assertEqual(
-            event_types,
-            ["user_message", "tool_call_sql", "tool_result_sql", "assistant_message"],
+            tuple(self._extract_event_types(payloads)),
+            _SQL_TURN_EVENT_TYPES,
         )
 
         skipped_deltas = [
@@ -1935,7 +1786,7 @@ class ChatApiTests(unittest.TestCase):
         (not pre-extracted code), so we verify the deltas reconstruct to the
         full arguments JSON.
         """
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -1956,17 +1807,13 @@ class ChatApiTests(unittest.TestCase):
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="stream sql deltas",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="stream sql deltas",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
         sql_deltas = [
@@ -1985,42 +1832,32 @@ class ChatApiTests(unittest.TestCase):
             for delta in sql_deltas
             if isinstance(delta.get("delta"), str)
         ]
-        reconstructed = json.loads("".join(raw_chunks))
+        reconstructed = _loads("".join(raw_chunks))
         self.assertEqual(
             reconstructed,
             {"sql": "SELECT 123 AS value\nFROM (SELECT 1) t", "limit": 5},
         )
 
     def test_chat_stream_emits_state_transition_deltas(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_state_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 1},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_state_sql", limit=1)],
                 ),
                 LlmResponse(text="done", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="stream state transitions",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="stream state transitions",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
         state_deltas = [
@@ -2039,7 +1876,7 @@ class ChatApiTests(unittest.TestCase):
     def test_chat_stream_retries_invalid_python_payload_without_persisting_error_cells(
         self,
     ) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -2077,32 +1914,22 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="continue with python",
+            provider="openrouter",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="continue with python",
-                        provider="openrouter",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
         self.assertEqual(fake_execute_python_tool.await_count, 1)
 
-        event_payloads = [
-            payload["event"] for payload in payloads if "event" in payload
-        ]
-        event_types = [event["type"] for event in event_payloads]
-        self.assertEqual(
-            event_types,
-            ["user_message", "assistant_message"],
-        )
+        event_types = self._extract_event_types(payloads)
+        self.assertEqual(tuple(event_types), _PLAIN_TURN_EVENT_TYPES)
 
         invalid_skips = [
             payload["delta"]
@@ -2115,12 +1942,10 @@ class ChatApiTests(unittest.TestCase):
         self.assertEqual(len(invalid_skips), 1)
         self.assertEqual(invalid_skips[0].get("call_id"), "call_py_invalid")
 
-        self.assertFalse(
-            any(event["type"] == "tool_result_python" for event in event_payloads)
-        )
+        self.assertNotIn("tool_result_python", event_types)
 
     def test_chat_includes_sql_data_checkpoint_in_followup_llm_context(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
 
         class CaptureClient(FakeLlmClient):
@@ -2136,28 +1961,19 @@ class ChatApiTests(unittest.TestCase):
             responses=[
                 LlmResponse(
                     text=None,
-                    tool_calls=[
-                        ToolCall(
-                            id="call_data_intent_sql",
-                            name="run_sql",
-                            arguments={"sql": "SELECT 1 AS x", "limit": 5},
-                        )
-                    ],
+                    tool_calls=[_sql_tool_call("call_data_intent_sql", limit=5)],
                 ),
                 LlmResponse(text="done", tool_calls=[]),
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="query and continue",
-                        provider="openai",
-                    )
-                )
-            )
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="query and continue",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 2)
         self.assertEqual(result["events"][-1]["type"], "assistant_message")
@@ -2177,7 +1993,7 @@ class ChatApiTests(unittest.TestCase):
     def test_chat_stream_enforces_python_tool_before_finalizing_python_intent(
         self,
     ) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -2206,31 +2022,24 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="continue with python chart",
+            provider="openrouter",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="continue with python chart",
-                        provider="openrouter",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
         self.assertEqual(fake_client.calls, 3)
         self.assertEqual(fake_execute_python_tool.await_count, 1)
 
-        event_types = [
-            payload["event"]["type"] for payload in payloads if "event" in payload
-        ]
         self.assertEqual(
-            event_types,
-            ["user_message", "assistant_message"],
+            tuple(self._extract_event_types(payloads)),
+            _PLAIN_TURN_EVENT_TYPES,
         )
 
         state_deltas = [
@@ -2243,7 +2052,7 @@ class ChatApiTests(unittest.TestCase):
         self.assertIn("retry_after_missing_required_tool", reasons)
 
     def test_chat_enforces_python_tool_before_finalizing_python_intent(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -2272,25 +2081,22 @@ class ChatApiTests(unittest.TestCase):
             }
         )
 
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="Please continue with python analysis and make a chart",
+            provider="openai",
+        )
         with (
-            patch.object(chat_api, "build_llm_client", return_value=fake_client),
+            override_llm_client(fake_client),
             patch("chat.engine.execute_python_tool", fake_execute_python_tool),
         ):
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="Please continue with python analysis and make a chart",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
         self.assertEqual(fake_client.calls, 3)
         self.assertEqual(fake_execute_python_tool.await_count, 1)
         self.assertEqual(
-            [event["type"] for event in result["events"]],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in result["events"]),
+            _PLAIN_TURN_EVENT_TYPES,
         )
 
         assistant_payload = result["events"][-1]["payload"]
@@ -2310,7 +2116,7 @@ class ChatApiTests(unittest.TestCase):
     def test_engine_run_turn_allow_tools_false_disables_tools_and_still_persists_assistant(
         self,
     ) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
 
         class CaptureClient(FakeLlmClient):
@@ -2340,8 +2146,8 @@ class ChatApiTests(unittest.TestCase):
         self.assertEqual(len(fake_client.generate_kwargs), 1)
         self.assertEqual(fake_client.generate_kwargs[0]["tools"], [])
         self.assertEqual(
-            [event["type"] for event in events],
-            ["user_message", "assistant_message"],
+            tuple(event["type"] for event in events),
+            _PLAIN_TURN_EVENT_TYPES,
         )
 
         assistant_payload = events[-1]["payload"]
@@ -2362,7 +2168,7 @@ class ChatApiTests(unittest.TestCase):
         """When the LLM returns text AND tool calls, the text should be
         persisted as an ``assistant_plan`` event (not lost).
         """
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -2380,28 +2186,24 @@ class ChatApiTests(unittest.TestCase):
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="what is the answer?",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
             # Test via the non-streaming endpoint (assistant_plan is persisted)
-            result = self._run(
-                chat_api.chat(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="what is the answer?",
-                        provider="openai",
-                    )
-                )
-            )
+            result = self._run(chat_api.chat(request))
 
-        event_types = [event["type"] for event in result["events"]]
         self.assertEqual(
-            event_types,
-            [
+            tuple(event["type"] for event in result["events"]),
+            (
                 "user_message",
                 "assistant_plan",
                 "tool_call_sql",
                 "tool_result_sql",
                 "assistant_message",
-            ],
+            ),
         )
         plan_event = next(e for e in result["events"] if e["type"] == "assistant_plan")
         self.assertEqual(
@@ -2418,7 +2220,7 @@ class ChatApiTests(unittest.TestCase):
         - streaming text deltas (assistant_text)
         - a persisted event (assistant_plan)
         """
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
         fake_client = FakeLlmClient(
             responses=[
@@ -2436,58 +2238,39 @@ class ChatApiTests(unittest.TestCase):
             ]
         )
 
-        with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-            response = self._run(
-                chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="think and act",
-                        provider="openai",
-                    )
-                )
-            )
-            raw_stream = self._run(self._consume_stream(response))
+        request = chat_api.ChatRequest(
+            worldline_id=worldline_id,
+            message="think and act",
+            provider="openai",
+        )
+        with override_llm_client(fake_client):
+            _, raw_stream = self._run(self._call_and_drain(request))
             payloads = self._extract_sse_payloads(raw_stream)
 
+        text_delta_count = 0
+        event_types: set[str] = set()
+        for payload in payloads:
+            delta = payload.get("delta")
+            if delta and delta.get("type") == "assistant_text":
+                text_delta_count += 1
+            event = payload.get("event")
+            if event:
+                event_types.add(event["type"])
+
         # Check that we got assistant_text deltas (the thinking text streamed)
-        text_deltas = [
-            p["delta"]
-            for p in payloads
-            if "delta" in p and p["delta"]["type"] == "assistant_text"
-        ]
-        self.assertTrue(len(text_deltas) > 0, "Expected assistant_text deltas")
+        self.assertTrue(text_delta_count > 0, "Expected assistant_text deltas")
 
         # Check that we got an assistant_plan persisted event
-        event_types = [p["event"]["type"] for p in payloads if "event" in p]
-        self.assertIn("assistant_plan", event_types)
-        self.assertIn("tool_call_sql", event_types)
-        self.assertIn("assistant_message", event_types)
+        required = {"assistant_plan", "tool_call_sql", "assistant_message"}
+        self.assertTrue(required <= event_types, f"missing: {required - event_types}")
 
         # The final payload should be done
         self.assertTrue(payloads[-1]["done"])
 
     def test_chat_stream_disconnect_does_not_cancel_subagent_terminal_result(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        with meta.get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO events (id, worldline_id, parent_event_id, type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    "event_seed_stream_disconnect",
-                    worldline_id,
-                    None,
-                    "assistant_message",
-                    json.dumps({"text": "seed"}),
-                ),
-            )
-            conn.execute(
-                "UPDATE worldlines SET head_event_id = ? WHERE id = ?",
-                ("event_seed_stream_disconnect", worldline_id),
-            )
-            conn.commit()
+        self._seed_head_event(worldline_id, "event_seed_stream_disconnect")
 
         fake_client = FakeLlmClient(
             responses=[
@@ -2535,61 +2318,45 @@ class ChatApiTests(unittest.TestCase):
                 ],
             }
 
-        async def scenario() -> str:
+        async def scenario() -> set[str]:
+            request = chat_api.ChatRequest(
+                worldline_id=worldline_id,
+                message="run fanout then disconnect",
+                provider="openai",
+            )
             with (
-                patch.object(chat_api, "build_llm_client", return_value=fake_client),
-                patch(
-                    "chat.engine.should_use_semantic_lane",
-                    AsyncMock(return_value=(False, None)),
-                ),
-                patch(
-                    "chat.engine.spawn_subagents_blocking",
-                    AsyncMock(side_effect=delayed_spawn),
-                ),
+                override_llm_client(fake_client),
+                patch("chat.engine.spawn_subagents_blocking", new=delayed_spawn),
             ):
-                response = await chat_api.chat_stream(
-                    chat_api.ChatRequest(
-                        worldline_id=worldline_id,
-                        message="run fanout then disconnect",
-                        provider="openai",
-                    )
-                )
+                response = await chat_api.chat_stream(request)
                 _ = await self._consume_stream_first_n(response, 1)
-                await asyncio.sleep(1.2)
-                events_payload = await worldlines.get_worldline_events(
-                    worldline_id,
-                    limit=100,
+                events = await self._await_event_type(
+                    worldline_id, "tool_result_subagents"
                 )
-                event_types = [event["type"] for event in events_payload["events"]]
-                return ",".join(event_types)
+                return {event["type"] for event in events}
 
-        event_types_serialized = self._run(scenario())
-        self.assertIn("tool_call_subagents", event_types_serialized)
-        self.assertIn("tool_result_subagents", event_types_serialized)
+        event_types = self._run(scenario())
+        required = {"tool_call_subagents", "tool_result_subagents"}
+        self.assertTrue(required <= event_types, f"missing: {required - event_types}")
 
     # ---- job queue endpoint tests --------------------------------------------
 
     def test_create_chat_job_processes_in_background(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Background complete.", tool_calls=[])]
-        )
+        fake_client = _client(("Background complete.", ()))
 
         async def scenario() -> tuple[dict, dict]:
-            with patch.object(
-                chat_runtime, "build_llm_client", return_value=fake_client
-            ):
-                created = await chat_api.create_chat_job(
-                    chat_api.ChatJobRequest(
-                        worldline_id=worldline_id,
-                        message="run this in background",
-                        provider="openai",
-                    )
-                )
+            request = chat_api.ChatJobRequest(
+                worldline_id=worldline_id,
+                message="run this in background",
+                provider="openai",
+            )
+            with override_llm_client(fake_client):
+                created = await chat_api.create_chat_job(request)
                 done = await self._wait_for_job_status(
                     created["id"],
-                    expected={"completed", "failed"},
+                    expected=_TERMINAL_STATUSES,
                     timeout_s=3.0,
                 )
                 return created, done
@@ -2605,26 +2372,21 @@ class ChatApiTests(unittest.TestCase):
         )
 
     def test_chat_job_list_and_ack(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[LlmResponse(text="Done for ack.", tool_calls=[])]
-        )
+        fake_client = _client(("Done for ack.", ()))
 
         async def scenario() -> tuple[dict, dict, dict]:
-            with patch.object(
-                chat_runtime, "build_llm_client", return_value=fake_client
-            ):
-                created = await chat_api.create_chat_job(
-                    chat_api.ChatJobRequest(
-                        worldline_id=worldline_id,
-                        message="job to ack",
-                        provider="openrouter",
-                    )
-                )
+            request = chat_api.ChatJobRequest(
+                worldline_id=worldline_id,
+                message="job to ack",
+                provider="openrouter",
+            )
+            with override_llm_client(fake_client):
+                created = await chat_api.create_chat_job(request)
                 await self._wait_for_job_status(
                     created["id"],
-                    expected={"completed", "failed"},
+                    expected=_TERMINAL_STATUSES,
                     timeout_s=3.0,
                 )
                 listed = await chat_api.list_chat_jobs(
@@ -2644,40 +2406,37 @@ class ChatApiTests(unittest.TestCase):
         self.assertIsNotNone(acked["seen_at"])
 
     def test_chat_jobs_same_worldline_execute_fifo(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         worldline_id = self._create_worldline(thread_id)
-        fake_client = FakeLlmClient(
-            responses=[
-                LlmResponse(text="first done", tool_calls=[]),
-                LlmResponse(text="second done", tool_calls=[]),
-            ]
-        )
+        fake_client = _client(("first done", ()), ("second done", ()))
 
         async def scenario() -> list[str]:
-            with patch.object(chat_api, "build_llm_client", return_value=fake_client):
-                first = await chat_api.create_chat_job(
-                    chat_api.ChatJobRequest(
-                        worldline_id=worldline_id,
-                        message="first message",
-                        provider="openai",
-                    )
-                )
-                second = await chat_api.create_chat_job(
-                    chat_api.ChatJobRequest(
-                        worldline_id=worldline_id,
-                        message="second message",
-                        provider="openai",
-                    )
-                )
-                await self._wait_for_job_status(
-                    first["id"],
-                    expected={"completed", "failed"},
-                    timeout_s=3.0,
-                )
-                await self._wait_for_job_status(
-                    second["id"],
-                    expected={"completed", "failed"},
-                    timeout_s=3.0,
+            first_request = chat_api.ChatJobRequest(
+                worldline_id=worldline_id,
+                message="first message",
+                provider="openai",
+            )
+            second_request = chat_api.ChatJobRequest(
+                worldline_id=worldline_id,
+                message="second message",
+                provider="openai",
+            )
+            with override_llm_client(fake_client):
+                # Enqueue in order (that order is what's under test), then
+                # wait on both jobs together.
+                first = await chat_api.create_chat_job(first_request)
+                second = await chat_api.create_chat_job(second_request)
+                await asyncio.gather(
+                    self._wait_for_job_status(
+                        first["id"],
+                        expected=_TERMINAL_STATUSES,
+                        timeout_s=3.0,
+                    ),
+                    self._wait_for_job_status(
+                        second["id"],
+                        expected=_TERMINAL_STATUSES,
+                        timeout_s=3.0,
+                    ),
                 )
                 events_payload = await worldlines.get_worldline_events(
                     worldline_id, limit=50
@@ -2693,7 +2452,7 @@ class ChatApiTests(unittest.TestCase):
         self.assertEqual(user_messages[-2:], ["first message", "second message"])
 
     def test_chat_session_prefers_running_worldline_and_keeps_creation_order(self) -> None:
-        thread_id = self._create_thread()
+        thread_id = self._thread_id
         main_worldline_id = self._create_worldline(thread_id, "main")
         branch_worldline_id = self._create_worldline(thread_id, "branch-a")
 
@@ -2714,7 +2473,7 @@ class ChatApiTests(unittest.TestCase):
                     meta.new_id("job"),
                     thread_id,
                     branch_worldline_id,
-                    json.dumps({"message": "running"}, ensure_ascii=True),
+                    _RUNNING_JOB_REQUEST_JSON,
                     "running",
                 ),
             )
@@ -56,6 +56,18 @@ class ChatContextParserTests(unittest.TestCase):
 """
         self.assertIsNone(extract_output_type(message))
 
+    def test_reads_both_keys_case_insensitively_first_value_wins(self) -> None:
+        message = """please analyze
+
+<CONTEXT>
+- Output_Type=Dashboard
+- connectors=warehouse
+- output_type=report
+</CONTEXT>
+"""
+        self.assertEqual(extract_output_type(message), "dashboard")
+        self.assertEqual(extract_selected_external_aliases(message), ["warehouse"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,10 @@
 import asyncio
 import json
+import sqlite3
 import tempfile
 import time
 import unittest
+from dataclasses import dataclass
 from pathlib import Path
 
 import meta
@@ -11,8 +13,29 @@ import api.worldlines as worldlines
 from chat.jobs import JOB_STATUS_RUNNING, ChatJobScheduler, WorldlineTurnCoordinator
 from chat.jobs import enqueue_chat_turn_job
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_JOB_STATUS_SQL = (
+    "SELECT status, result_summary_json, started_at, finished_at"
+    " FROM chat_turn_jobs WHERE id = ?"
+)
+
+
+@dataclass(frozen=True)
+class _EngineRequest:
+    provider: str | None
+    model: str | None
+    max_iterations: int
+
 
 class _FakeEngine:
+    __slots__ = ("_output_text", "_calls", "_delay_s", "_timeline")
+
     def __init__(
         self,
         *,
@@ -42,63 +65,94 @@ class _FakeEngine:
         ]
 
 
-class ChatJobSchedulerTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.temp_dir = tempfile.TemporaryDirectory()
-        temp_root = Path(self.temp_dir.name)
-
-        meta.DB_DIR = temp_root / "data"
-        meta.DB_PATH = meta.DB_DIR / "meta.db"
+class ChatJobSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Shared-cache in-memory DB, migrated once and kept alive by
+        # ``_keepalive``; get_conn still needs a real DB_DIR to mkdir.
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._db_dir = Path(cls._temp_dir.name) / "data"
+        cls._db_path = f"file:chat_jobs_tests_{id(cls)}?mode=memory&cache=shared"
+        cls._keepalive = sqlite3.connect(cls._db_path, uri=True)
+        meta.DB_DIR = cls._db_dir
+        meta.DB_PATH = cls._db_path
         meta.init_meta_db()
+        with meta.get_conn() as conn:
+            cls._tables = [
+                row["name"]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master"
+                    " WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )
+            ]
 
-    def tearDown(self) -> None:
-        self.temp_dir.cleanup()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._keepalive.close()
+        cls._temp_dir.cleanup()
 
-    def _run(self, coro):
-        return asyncio.run(coro)
+    def setUp(self) -> None:
+        meta.DB_DIR = self._db_dir
+        meta.DB_PATH = self._db_path
+        with meta.get_conn() as conn:
+            conn.execute("PRAGMA foreign_keys = OFF;")
+            for table in self._tables:
+                conn.execute(f"DELETE FROM {table}")
+            conn.commit()
 
-    def _create_thread(self, title: str = "chat-job-test-thread") -> str:
-        response = self._run(
-            threads.create_thread(threads.CreateThreadRequest(title=title))
+    def _make_scheduler(self, engine_factory) -> ChatJobScheduler:
+        # Cleanups run LIFO, so the scheduler shuts down before its coordinator.
+        coordinator = WorldlineTurnCoordinator()
+        scheduler = ChatJobScheduler(
+            turn_coordinator=coordinator,
+            engine_factory=engine_factory,
         )
+        self.addAsyncCleanup(coordinator.shutdown)
+        self.addAsyncCleanup(scheduler.shutdown)
+        return scheduler
+
+    async def _create_thread(self, title: str = "chat-job-test-thread") -> str:
+        response = await threads.create_thread(threads.CreateThreadRequest(title=title))
         return response["thread_id"]
 
-    def _create_worldline(self, thread_id: str, name: str = "main") -> str:
-        response = self._run(
-            worldlines.create_worldline(
-                worldlines.CreateWorldlineRequest(thread_id=thread_id, name=name)
-            )
+    async def _create_worldline(self, thread_id: str, name: str = "main") -> str:
+        response = await worldlines.create_worldline(
+            worldlines.CreateWorldlineRequest(thread_id=thread_id, name=name)
         )
         return response["worldline_id"]
 
+    def _load_job_row(self, job_id: str):
+        with meta.get_conn() as conn:
+            return conn.execute(_JOB_STATUS_SQL, (job_id,)).fetchone()
+
     async def _wait_for_status(
         self,
+        scheduler: ChatJobScheduler,
         job_id: str,
         *,
         expected: set[str],
         timeout_s: float = 2.0,
     ):
-        deadline = time.monotonic() + timeout_s
-        while time.monotonic() < deadline:
-            with meta.get_conn() as conn:
-                row = conn.execute(
-                    """
-                    SELECT status, result_summary_json, started_at, finished_at
-                    FROM chat_turn_jobs
-                    WHERE id = ?
-                    """,
-                    (job_id,),
-                ).fetchone()
-
-            if row is not None and row["status"] in expected:
-                return row
-            await asyncio.sleep(0.03)
-
+        finished = scheduler.subscribe(job_id)
+        try:
+            row = self._load_job_row(job_id)
+            if row is None or row["status"] not in expected:
+                try:
+                    async with asyncio.timeout(timeout_s):
+                        await finished.wait()
+                except TimeoutError:
+                    pass
+                row = self._load_job_row(job_id)
+        finally:
+            scheduler.unsubscribe(job_id, finished)
+
+        if row is not None and row["status"] in expected:
+            return row
         raise AssertionError(f"job {job_id} did not reach expected statuses {expected}")
 
-    def test_scheduler_requeues_running_jobs_on_startup(self) -> None:
-        thread_id = self._create_thread()
-        worldline_id = self._create_worldline(thread_id)
+    async def test_scheduler_requeues_running_jobs_on_startup(self) -> None:
+        thread_id = await self._create_thread()
+        worldline_id = await self._create_worldline(thread_id)
 
         job_id = enqueue_chat_turn_job(
             thread_id=thread_id,
@@ -121,47 +175,37 @@ class ChatJobSchedulerTests(unittest.TestCase):
             conn.commit()
 
         run_calls: list[str] = []
+        factory_calls: list[_EngineRequest] = []
 
         def engine_factory(
             provider: str | None, model: str | None, max_iterations: int
         ):
-            self.assertEqual(provider, "openai")
-            self.assertEqual(model, "model-a")
-            self.assertEqual(max_iterations, 9)
+            factory_calls.append(_EngineRequest(provider, model, max_iterations))
             return _FakeEngine(output_text="Recovered after restart.", calls=run_calls)
 
-        coordinator = WorldlineTurnCoordinator()
-        scheduler = ChatJobScheduler(
-            turn_coordinator=coordinator,
-            engine_factory=engine_factory,
-        )
-
-        async def scenario():
-            try:
-                await scheduler.start()
-                return await self._wait_for_status(
-                    job_id,
-                    expected={"completed", "failed"},
-                    timeout_s=3.0,
-                )
-            finally:
-                await scheduler.shutdown()
-                await coordinator.shutdown()
+        scheduler = self._make_scheduler(engine_factory)
 
-        done_row = self._run(scenario())
+        await scheduler.start()
+        done_row = await self._wait_for_status(
+            scheduler,
+            job_id,
+            expected={"completed", "failed"},
+            timeout_s=3.0,
+        )
 
         self.assertEqual(done_row["status"], "completed")
         self.assertEqual(run_calls, ["resume this"])
+        self.assertEqual(factory_calls, [_EngineRequest("openai", "model-a", 9)])
         self.assertIsNotNone(done_row["started_at"])
         self.assertIsNotNone(done_row["finished_at"])
 
-        summary = json.loads(done_row["result_summary_json"])
+        summary = _loads(done_row["result_summary_json"])
         self.assertEqual(summary.get("event_count"), 1)
         self.assertIn("Recovered after restart.", summary.get("assistant_preview", ""))
 
-    def test_scheduler_start_is_idempotent_for_queued_jobs(self) -> None:
-        thread_id = self._create_thread(title="chat-job-idempotent-thread")
-        worldline_id = self._create_worldline(thread_id)
+    async def test_scheduler_start_is_idempotent_for_queued_jobs(self) -> None:
+        thread_id = await self._create_thread(title="chat-job-idempotent-thread")
+        worldline_id = await self._create_worldline(thread_id)
 
         job_id = enqueue_chat_turn_job(
             thread_id=thread_id,
@@ -173,43 +217,33 @@ class ChatJobSchedulerTests(unittest.TestCase):
         )
 
         run_calls: list[str] = []
+        factory_calls: list[_EngineRequest] = []
 
         def engine_factory(
             provider: str | None, model: str | None, max_iterations: int
         ):
-            self.assertEqual(provider, "openrouter")
-            self.assertIsNone(model)
-            self.assertEqual(max_iterations, 6)
+            factory_calls.append(_EngineRequest(provider, model, max_iterations))
             return _FakeEngine(output_text="Single execution.", calls=run_calls)
 
-        coordinator = WorldlineTurnCoordinator()
-        scheduler = ChatJobScheduler(
-            turn_coordinator=coordinator,
-            engine_factory=engine_factory,
-        )
-
-        async def scenario():
-            try:
-                await scheduler.start()
-                await scheduler.start()
-                return await self._wait_for_status(
-                    job_id,
-                    expected={"completed", "failed"},
-                    timeout_s=3.0,
-                )
-            finally:
-                await scheduler.shutdown()
-                await coordinator.shutdown()
+        scheduler = self._make_scheduler(engine_factory)
 
-        done_row = self._run(scenario())
+        await scheduler.start()
+        await scheduler.start()
+        done_row = await self._wait_for_status(
+            scheduler,
+            job_id,
+            expected={"completed", "failed"},
+            timeout_s=3.0,
+        )
 
         self.assertEqual(done_row["status"], "completed")
         self.assertEqual(run_calls, ["execute once"])
+        self.assertEqual(factory_calls, [_EngineRequest("openrouter", None, 6)])
 
-    def test_scheduler_runs_different_worldlines_in_parallel(self) -> None:
-        thread_id = self._create_thread(title="chat-job-parallel-thread")
-        worldline_a = self._create_worldline(thread_id, "a")
-        worldline_b = self._create_worldline(thread_id, "b")
+    async def test_scheduler_runs_different_worldlines_in_parallel(self) -> None:
+        thread_id = await self._create_thread(title="chat-job-parallel-thread")
+        worldline_a = await self._create_worldline(thread_id, "a")
+        worldline_b = await self._create_worldline(thread_id, "b")
 
         job_a = enqueue_chat_turn_job(
             thread_id=thread_id,
@@ -229,52 +263,45 @@ class ChatJobSchedulerTests(unittest.TestCase):
         )
 
         run_calls: list[str] = []
+        factory_calls: list[_EngineRequest] = []
         timeline: list[tuple[str, str, float]] = []
 
         def engine_factory(
             provider: str | None, model: str | None, max_iterations: int
         ):
-            self.assertEqual(provider, "openai")
-            self.assertIsNone(model)
-            self.assertEqual(max_iterations, 6)
+            factory_calls.append(_EngineRequest(provider, model, max_iterations))
             return _FakeEngine(
                 output_text="parallel",
                 calls=run_calls,
-                delay_s=0.2,
+                delay_s=0.05,
                 timeline=timeline,
             )
 
-        coordinator = WorldlineTurnCoordinator()
-        scheduler = ChatJobScheduler(
-            turn_coordinator=coordinator,
-            engine_factory=engine_factory,
-        )
+        scheduler = self._make_scheduler(engine_factory)
 
-        async def scenario():
-            try:
-                await scheduler.start()
-                await asyncio.gather(
-                    self._wait_for_status(
-                        job_a,
-                        expected={"completed", "failed"},
-                        timeout_s=3.0,
-                    ),
+        await scheduler.start()
+        async with asyncio.TaskGroup() as tg:
+            for job_id in (job_a, job_b):
+                tg.create_task(
                     self._wait_for_status(
-                        job_b,
+                        scheduler,
+                        job_id,
                         expected={"completed", "failed"},
                         timeout_s=3.0,
-                    ),
+                    )
                 )
-            finally:
-                await scheduler.shutdown()
-                await coordinator.shutdown()
-
-        self._run(scenario())
 
+        self.assertEqual(factory_calls, [_EngineRequest("openai", None, 6)] * 2)
         starts = [entry for entry in timeline if entry[1] == "start"]
         self.assertEqual(len(starts), 2)
         start_spread = abs(starts[0][2] - starts[1][2])
         self.assertLess(start_spread, 0.15)
+        # Both turns were in flight at once: the later start precedes the
+        # earlier end, which serialized execution could never satisfy.
+        ends = [entry for entry in timeline if entry[1] == "end"]
+        self.assertLess(
+            max(entry[2] for entry in starts), min(entry[2] for entry in ends)
+        )
 
 
 if __name__ == "__main__":
@@ -1,19 +1,25 @@
 import asyncio
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import AsyncMock
 
-import api.threads as threads
-import api.worldlines as worldlines
 import meta
 from chat.jobs import WorldlineTurnCoordinator
 from chat.llm_client import LlmResponse
 from chat.subagents import spawn_subagents_blocking
 from worldline_service import WorldlineService
 
+try:
+    import uvloop
+except ModuleNotFoundError:
+    uvloop = None
+
 
 class _FakeLlmClient:
+    __slots__ = ("_text",)
+
     def __init__(self, text: str) -> None:
         self._text = text
 
@@ -25,35 +31,64 @@ class _FakeLlmClient:
 
 
 class ChatSubagentTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.temp_dir = tempfile.TemporaryDirectory()
-        temp_root = Path(self.temp_dir.name)
-        meta.DB_DIR = temp_root / "data"
-        meta.DB_PATH = meta.DB_DIR / "meta.db"
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._runner = asyncio.Runner(
+            loop_factory=uvloop.new_event_loop if uvloop is not None else None
+        )
+        # Shared-cache in-memory DB, migrated once and kept alive by
+        # ``_keepalive``; get_conn still needs a real DB_DIR to mkdir.
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._db_dir = Path(cls._temp_dir.name) / "data"
+        cls._db_path = f"file:chat_subagent_tests_{id(cls)}?mode=memory&cache=shared"
+        cls._keepalive = sqlite3.connect(cls._db_path, uri=True)
+        meta.DB_DIR = cls._db_dir
+        meta.DB_PATH = cls._db_path
         meta.init_meta_db()
+        # WorldlineService holds no state of its own; one instance serves
+        # every test.
+        cls._worldline_service = WorldlineService()
+        with meta.get_conn() as conn:
+            cls._tables = [
+                row["name"]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master"
+                    " WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )
+            ]
 
-    def tearDown(self) -> None:
-        self.temp_dir.cleanup()
-
-    def _run(self, coro):
-        return asyncio.run(coro)
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._runner.close()
+        cls._keepalive.close()
+        cls._temp_dir.cleanup()
 
-    def _create_thread(self) -> str:
-        response = self._run(
-            threads.create_thread(threads.CreateThreadRequest(title="subagent-test"))
-        )
-        return response["thread_id"]
+    def setUp(self) -> None:
+        meta.DB_DIR = self._db_dir
+        meta.DB_PATH = self._db_path
+        with meta.get_conn() as conn:
+            conn.execute("PRAGMA foreign_keys = OFF;")
+            for table in self._tables:
+                conn.execute(f"DELETE FROM {table}")
+            conn.commit()
 
-    def _create_worldline(self, thread_id: str) -> str:
-        response = self._run(
-            worldlines.create_worldline(
-                worldlines.CreateWorldlineRequest(thread_id=thread_id, name="main")
-            )
-        )
-        return response["worldline_id"]
+    def _run(self, coro):
+        return self._runner.run(coro)
 
-    def _append_anchor_event(self, worldline_id: str) -> str:
+    def _bootstrap_worldline(self) -> tuple[str, str]:
+        """Create a thread, its main worldline and an anchor event in one
+        transaction; return ``(worldline_id, anchor_event_id)``."""
+        thread_id = meta.new_id("thread")
+        worldline_id = meta.new_id("worldline")
         with meta.get_conn() as conn:
+            conn.execute(
+                "INSERT INTO threads (id, title) VALUES (?, ?)",
+                (thread_id, "subagent-test"),
+            )
+            conn.execute(
+                "INSERT INTO worldlines (id, thread_id, name) VALUES (?, ?, ?)",
+                (worldline_id, thread_id, "main"),
+            )
             event_id = meta.append_event_and_advance_head(
                 conn,
                 worldline_id=worldline_id,
@@ -62,14 +97,37 @@ class ChatSubagentTests(unittest.TestCase):
                 payload={"text": "anchor"},
             )
             conn.commit()
-        return event_id
+        return worldline_id, event_id
 
-    def test_spawn_subagents_blocking_fanout_and_lineage(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
+    def _spawn(
+        self,
+        source_worldline_id: str,
+        from_event_id: str,
+        *,
+        tasks: list[dict] | None = None,
+        goal: str | None = None,
+        llm_text: str = "",
+        **kwargs,
+    ) -> dict:
+        """Run ``spawn_subagents_blocking`` with a fresh coordinator and fakes."""
+        return self._run(
+            spawn_subagents_blocking(
+                source_worldline_id=source_worldline_id,
+                from_event_id=from_event_id,
+                tasks=tasks,
+                goal=goal,
+                worldline_service=self._worldline_service,
+                llm_client=_FakeLlmClient(text=llm_text),
+                turn_coordinator=WorldlineTurnCoordinator(),
+                **kwargs,
+            )
+        )
 
-        coordinator = WorldlineTurnCoordinator()
+    def _assert_result_fields(self, result: dict, **expected) -> None:
+        self.assertEqual({key: result[key] for key in expected}, expected)
+
+    def test_spawn_subagents_blocking_fanout_and_lineage(self) -> None:
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -79,7 +137,7 @@ class ChatSubagentTests(unittest.TestCase):
         ):
             _ = child_max_iterations
             _ = allow_tools
-            await asyncio.sleep(0.03)
+            await asyncio.sleep(0)
             return child_worldline_id, [
                 {
                     "type": "assistant_message",
@@ -87,40 +145,35 @@ class ChatSubagentTests(unittest.TestCase):
                 }
             ]
 
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[
-                    {"message": "investigate state A", "label": "A"},
-                    {"message": "investigate state B", "label": "B"},
-                ],
-                goal=None,
-                tool_call_id="call_spawn_1",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                timeout_s=1,
-                max_iterations=5,
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[
+                {"message": "investigate state A", "label": "A"},
+                {"message": "investigate state B", "label": "B"},
+            ],
+            tool_call_id="call_spawn_1",
+            run_child_turn=_run_child_turn,
+            timeout_s=1,
+            max_iterations=5,
         )
 
-        self.assertEqual(result["task_count"], 2)
-        self.assertEqual(result["requested_task_count"], 2)
-        self.assertEqual(result["accepted_task_count"], 2)
-        self.assertEqual(result["truncated_task_count"], 0)
-        self.assertEqual(result["max_subagents"], 6)  # Conservative default for demo
-        self.assertEqual(
-            result["max_parallel_subagents"], 2
-        )  # Conservative default for demo
-        self.assertEqual(result["completed_count"], 2)
-        self.assertEqual(result["failed_count"], 0)
-        self.assertEqual(result["timed_out_count"], 0)
-        self.assertEqual(result["loop_limit_failure_count"], 0)
-        self.assertEqual(result["retried_task_count"], 0)
-        self.assertEqual(result["recovered_task_count"], 0)
-        self.assertEqual(result["failure_summary"], {})
+        self._assert_result_fields(
+            result,
+            task_count=2,
+            requested_task_count=2,
+            accepted_task_count=2,
+            truncated_task_count=0,
+            max_subagents=6,  # Conservative default for demo
+            max_parallel_subagents=2,  # Conservative default for demo
+            completed_count=2,
+            failed_count=0,
+            timed_out_count=0,
+            loop_limit_failure_count=0,
+            retried_task_count=0,
+            recovered_task_count=0,
+            failure_summary={},
+        )
         self.assertTrue(result["all_completed"])
         self.assertFalse(result["partial_failure"])
         self.assertEqual(len(result["tasks"]), 2)
@@ -150,11 +203,7 @@ class ChatSubagentTests(unittest.TestCase):
             self.assertEqual(row["forked_from_event_id"], anchor_event_id)
 
     def test_spawn_subagents_blocking_handles_failures_and_timeouts(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -170,7 +219,7 @@ class ChatSubagentTests(unittest.TestCase):
             if "slow" in child_message:
                 await asyncio.sleep(2.0)
                 return "worldline_unused", []
-            await asyncio.sleep(0.03)
+            await asyncio.sleep(0)
             return "worldline_ok", [
                 {
                     "type": "assistant_message",
@@ -178,30 +227,27 @@ class ChatSubagentTests(unittest.TestCase):
                 }
             ]
 
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[
-                    {"message": "normal", "label": "ok-me"},
-                    {"message": "broken", "label": "fail-me"},
-                    {"message": "slow", "label": "hang-me"},
-                ],
-                goal=None,
-                tool_call_id="call_spawn_2",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                timeout_s=1,
-                max_iterations=4,
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[
+                {"message": "normal", "label": "ok-me"},
+                {"message": "broken", "label": "fail-me"},
+                {"message": "slow", "label": "hang-me"},
+            ],
+            tool_call_id="call_spawn_2",
+            run_child_turn=_run_child_turn,
+            timeout_s=1,
+            max_iterations=4,
         )
 
-        self.assertEqual(result["task_count"], 3)
-        self.assertEqual(result["completed_count"], 1)
-        self.assertEqual(result["failed_count"], 1)
-        self.assertEqual(result["timed_out_count"], 1)
+        self._assert_result_fields(
+            result,
+            task_count=3,
+            completed_count=1,
+            failed_count=1,
+            timed_out_count=1,
+        )
         self.assertFalse(result["all_completed"])
         self.assertTrue(result["partial_failure"])
 
@@ -212,10 +258,7 @@ class ChatSubagentTests(unittest.TestCase):
         self.assertIn("timed out", str(by_label["hang-me"]["error"]))
 
     def test_spawn_subagents_blocking_derives_tasks_from_goal(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -237,30 +280,22 @@ class ChatSubagentTests(unittest.TestCase):
             '{"tasks":[{"label":"one","message":"investigate segment one"},'
             '{"label":"two","message":"investigate segment two"}]}'
         )
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=None,
-                goal="analyze all regions",
-                tool_call_id="call_spawn_3",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=llm_text),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                timeout_s=1,
-                max_iterations=4,
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            goal="analyze all regions",
+            tool_call_id="call_spawn_3",
+            llm_text=llm_text,
+            run_child_turn=_run_child_turn,
+            timeout_s=1,
+            max_iterations=4,
         )
         self.assertEqual(result["task_count"], 2)
         self.assertEqual(result["completed_count"], 2)
         self.assertFalse(result["partial_failure"])
 
     def test_spawn_subagents_blocking_cancellation_maps_to_timeout(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -280,39 +315,33 @@ class ChatSubagentTests(unittest.TestCase):
                 }
             ]
 
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[
-                    {"message": "cancel me", "label": "cancelled"},
-                    {"message": "normal", "label": "ok"},
-                ],
-                goal=None,
-                tool_call_id="call_spawn_cancel",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                timeout_s=1,
-                max_iterations=4,
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[
+                {"message": "cancel me", "label": "cancelled"},
+                {"message": "normal", "label": "ok"},
+            ],
+            tool_call_id="call_spawn_cancel",
+            run_child_turn=_run_child_turn,
+            timeout_s=1,
+            max_iterations=4,
         )
 
-        self.assertEqual(result["task_count"], 2)
-        self.assertEqual(result["completed_count"], 1)
-        self.assertEqual(result["failed_count"], 0)
-        self.assertEqual(result["timed_out_count"], 1)
+        self._assert_result_fields(
+            result,
+            task_count=2,
+            completed_count=1,
+            failed_count=0,
+            timed_out_count=1,
+        )
         self.assertTrue(result["partial_failure"])
         by_label = {str(task["task_label"]): task for task in result["tasks"]}
         self.assertEqual(by_label["cancelled"]["status"], "timeout")
         self.assertEqual(by_label["ok"]["status"], "completed")
 
     def test_spawn_subagents_blocking_reports_task_truncation_and_limits(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -331,39 +360,34 @@ class ChatSubagentTests(unittest.TestCase):
             ]
 
         tasks = [{"message": f"task-{idx}", "label": f"t-{idx}"} for idx in range(12)]
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=tasks,
-                goal=None,
-                tool_call_id="call_spawn_limits",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                timeout_s=10,
-                max_iterations=4,
-                max_subagents=10,
-                max_parallel_subagents=3,  # Capped at _MAX_PARALLEL_SUBAGENTS (3)
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=tasks,
+            tool_call_id="call_spawn_limits",
+            run_child_turn=_run_child_turn,
+            timeout_s=10,
+            max_iterations=4,
+            max_subagents=10,
+            max_parallel_subagents=3,  # Capped at _MAX_PARALLEL_SUBAGENTS (3)
         )
 
-        self.assertEqual(result["requested_task_count"], 12)
-        self.assertEqual(result["accepted_task_count"], 10)
-        self.assertEqual(result["truncated_task_count"], 2)
-        self.assertEqual(result["task_count"], 10)
-        self.assertEqual(result["max_subagents"], 10)
-        self.assertEqual(result["max_parallel_subagents"], 3)  # Capped at hard limit
+        self._assert_result_fields(
+            result,
+            requested_task_count=12,
+            accepted_task_count=10,
+            truncated_task_count=2,
+            task_count=10,
+            max_subagents=10,
+            max_parallel_subagents=3,  # Capped at hard limit
+        )
         self.assertEqual(len(result["tasks"]), 10)
 
     def test_spawn_subagents_blocking_retries_loop_limit_and_recovers(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
+
         attempts: list[tuple[str, bool]] = []
-        progress_updates: list[dict[str, object]] = []
+        retrying_updates: list[dict[str, object]] = []
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -407,34 +431,32 @@ class ChatSubagentTests(unittest.TestCase):
             ]
 
         async def _on_progress(payload: dict[str, object]) -> None:
-            progress_updates.append(payload)
-
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[{"message": "loop then recover", "label": "recover"}],
-                goal=None,
-                tool_call_id="call_spawn_loop_recover",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                on_progress=_on_progress,
-                timeout_s=3,
-                max_iterations=4,
-            )
+            if payload.get("phase") == "retrying":
+                retrying_updates.append(payload)
+
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[{"message": "loop then recover", "label": "recover"}],
+            tool_call_id="call_spawn_loop_recover",
+            run_child_turn=_run_child_turn,
+            on_progress=_on_progress,
+            timeout_s=3,
+            max_iterations=4,
         )
 
         self.assertEqual(attempts[0][0], attempts[1][0])
         self.assertEqual([allow_tools for _, allow_tools in attempts], [True, False])
-        self.assertEqual(result["completed_count"], 1)
-        self.assertEqual(result["failed_count"], 0)
-        self.assertEqual(result["timed_out_count"], 0)
-        self.assertEqual(result["loop_limit_failure_count"], 0)
-        self.assertEqual(result["retried_task_count"], 1)
-        self.assertEqual(result["recovered_task_count"], 1)
-        self.assertEqual(result["failure_summary"], {})
+        self._assert_result_fields(
+            result,
+            completed_count=1,
+            failed_count=0,
+            timed_out_count=0,
+            loop_limit_failure_count=0,
+            retried_task_count=1,
+            recovered_task_count=1,
+            failure_summary={},
+        )
 
         task = result["tasks"][0]
         self.assertEqual(task["status"], "completed")
@@ -443,21 +465,16 @@ class ChatSubagentTests(unittest.TestCase):
         self.assertIsNone(task["failure_code"])
         self.assertEqual(task["terminal_reason"], "assistant_text_ready")
 
-        retrying_updates = [
-            update for update in progress_updates if update.get("phase") == "retrying"
-        ]
         self.assertEqual(len(retrying_updates), 1)
         self.assertEqual(retrying_updates[0]["retry_count"], 1)
 
     def test_spawn_subagents_blocking_marks_unrecovered_loop_limit_as_failed(
         self,
     ) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
+
         attempts: list[tuple[str, bool]] = []
-        progress_updates: list[dict[str, object]] = []
+        retrying_updates: list[dict[str, object]] = []
 
         async def _run_child_turn(
             child_worldline_id: str,
@@ -494,35 +511,36 @@ class ChatSubagentTests(unittest.TestCase):
             ]
 
         async def _on_progress(payload: dict[str, object]) -> None:
-            progress_updates.append(payload)
-
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[{"message": "loop forever", "label": "loop"}],
-                goal=None,
-                tool_call_id="call_spawn_loop_fail",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                on_progress=_on_progress,
-                timeout_s=3,
-                max_iterations=4,
-            )
+            if payload.get("phase") == "retrying":
+                retrying_updates.append(payload)
+
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[{"message": "loop forever", "label": "loop"}],
+            tool_call_id="call_spawn_loop_fail",
+            run_child_turn=_run_child_turn,
+            on_progress=_on_progress,
+            timeout_s=3,
+            max_iterations=4,
         )
 
         self.assertEqual(attempts[0][0], attempts[1][0])
         self.assertEqual([allow_tools for _, allow_tools in attempts], [True, False])
-        self.assertEqual(result["completed_count"], 0)
-        self.assertEqual(result["failed_count"], 1)
-        self.assertEqual(result["timed_out_count"], 0)
+        self._assert_result_fields(
+            result,
+            completed_count=0,
+            failed_count=1,
+            timed_out_count=0,
+        )
         self.assertTrue(result["partial_failure"])
-        self.assertEqual(result["loop_limit_failure_count"], 1)
-        self.assertEqual(result["retried_task_count"], 1)
-        self.assertEqual(result["recovered_task_count"], 0)
-        self.assertEqual(result["failure_summary"], {"subagent_loop_limit": 1})
+        self._assert_result_fields(
+            result,
+            loop_limit_failure_count=1,
+            retried_task_count=1,
+            recovered_task_count=0,
+            failure_summary={"subagent_loop_limit": 1},
+        )
 
         task = result["tasks"][0]
         self.assertEqual(task["status"], "failed")
@@ -531,17 +549,12 @@ class ChatSubagentTests(unittest.TestCase):
         self.assertFalse(task["recovered"])
         self.assertEqual(task["terminal_reason"], "max_iterations_reached")
 
-        retrying_updates = [
-            update for update in progress_updates if update.get("phase") == "retrying"
-        ]
         self.assertEqual(len(retrying_updates), 1)
         self.assertEqual(retrying_updates[0]["retry_count"], 1)
 
     def test_spawn_subagents_blocking_emits_progress_updates(self) -> None:
-        thread_id = self._create_thread()
-        source_worldline_id = self._create_worldline(thread_id)
-        anchor_event_id = self._append_anchor_event(source_worldline_id)
-        coordinator = WorldlineTurnCoordinator()
+        source_worldline_id, anchor_event_id = self._bootstrap_worldline()
+
         progress_updates: list[dict] = []
 
         async def _run_child_turn(
@@ -554,7 +567,7 @@ class ChatSubagentTests(unittest.TestCase):
             _ = child_message
             _ = child_max_iterations
             _ = allow_tools
-            await asyncio.sleep(0.02)
+            await asyncio.sleep(0)
             return "worldline_ok", [
                 {
                     "type": "assistant_message",
@@ -565,25 +578,19 @@ class ChatSubagentTests(unittest.TestCase):
         async def _on_progress(payload: dict) -> None:
             progress_updates.append(payload)
 
-        result = self._run(
-            spawn_subagents_blocking(
-                source_worldline_id=source_worldline_id,
-                from_event_id=anchor_event_id,
-                tasks=[
-                    {"message": "alpha", "label": "a"},
-                    {"message": "beta", "label": "b"},
-                ],
-                goal=None,
-                tool_call_id="call_spawn_progress",
-                worldline_service=WorldlineService(),
-                llm_client=_FakeLlmClient(text=""),
-                turn_coordinator=coordinator,
-                run_child_turn=_run_child_turn,
-                on_progress=_on_progress,
-                timeout_s=3,
-                max_iterations=4,
-                max_parallel_subagents=2,
-            )
+        result = self._spawn(
+            source_worldline_id,
+            anchor_event_id,
+            tasks=[
+                {"message": "alpha", "label": "a"},
+                {"message": "beta", "label": "b"},
+            ],
+            tool_call_id="call_spawn_progress",
+            run_child_turn=_run_child_turn,
+            on_progress=_on_progress,
+            timeout_s=3,
+            max_iterations=4,
+            max_parallel_subagents=2,
         )
 
         self.assertEqual(result["completed_count"], 2)
@@ -2,6 +2,7 @@ import asyncio
 import os
 import subprocess
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -11,21 +12,41 @@ from sandbox.docker_runner import DockerSandboxRunner
 
 
 class DockerRunnerTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.temp_dir = tempfile.TemporaryDirectory()
-        temp_root = Path(self.temp_dir.name)
-        meta.DB_DIR = temp_root / "data"
-        meta.DB_PATH = meta.DB_DIR / "meta.db"
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Tests use distinct worldline ids, so their workspaces never collide
+        # and one data directory and runner serve the whole class.
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        cls._db_dir = Path(cls._temp_dir.name) / "data"
+        cls._db_path = cls._db_dir / "meta.db"
+        meta.DB_DIR = cls._db_dir
+        meta.DB_PATH = cls._db_path
         meta.init_meta_db()
+        cls._sandbox = DockerSandboxRunner()
+        cls._runner = asyncio.Runner()
+        # Docker is "installed" for every test; the no-CLI tests patch
+        # ``which`` back to None on top of this.
+        cls._which_patch = patch(
+            "sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"
+        )
+        cls._which_patch.start()
 
-    def tearDown(self) -> None:
-        self.temp_dir.cleanup()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._which_patch.stop()
+        cls._runner.close()
+        cls._sandbox.shutdown()
+        cls._temp_dir.cleanup()
+
+    def setUp(self) -> None:
+        meta.DB_DIR = self._db_dir
+        meta.DB_PATH = self._db_path
 
     def _run(self, coro):
-        return asyncio.run(coro)
+        return self._runner.run(coro)
 
     def test_build_start_command_has_security_flags(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         workspace = Path("/tmp/workspace")
         cmd = runner._build_start_command("sb_1", workspace)
 
@@ -61,7 +82,7 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertEqual(runner.image, "custom/sandbox:latest")
 
     def test_execute_success_returns_stdout_and_artifacts(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         workspace = runner._workspace_dir("w_success")
         artifacts_dir = workspace / "artifacts"
 
@@ -72,10 +93,7 @@ class DockerRunnerTests(unittest.TestCase):
                 args=args[0], returncode=0, stdout="ok\n", stderr=""
             )
 
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run),
-        ):
+        with patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run):
             out = self._run(
                 runner.execute(
                     sandbox_id="sb_w_success",
@@ -95,7 +113,7 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertFalse((workspace / ".runner_input.py").exists())
 
     def test_execute_discovers_artifacts_saved_in_workspace_root(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         workspace = runner._workspace_dir("w_root_artifact")
 
         def fake_run(*args, **kwargs):
@@ -105,10 +123,7 @@ class DockerRunnerTests(unittest.TestCase):
                 args=args[0], returncode=0, stdout="", stderr=""
             )
 
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run),
-        ):
+        with patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run):
             out = self._run(
                 runner.execute(
                     sandbox_id="sb_w_root_artifact",
@@ -128,17 +143,14 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertEqual(found["type"], "image")
 
     def test_execute_nonzero_sets_error(self) -> None:
-        runner = DockerSandboxRunner()
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch(
-                "sandbox.docker_runner.subprocess.run",
-                return_value=subprocess.CompletedProcess(
-                    args=["docker", "run"],
-                    returncode=1,
-                    stdout="",
-                    stderr="boom",
-                ),
+        runner = self._sandbox
+        with patch(
+            "sandbox.docker_runner.subprocess.run",
+            return_value=subprocess.CompletedProcess(
+                args=["docker", "run"],
+                returncode=1,
+                stdout="",
+                stderr="boom",
             ),
         ):
             out = self._run(
@@ -155,7 +167,7 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertIn("boom", out["error"])
 
     def test_execute_timeout_returns_timeout_error(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         timeout_exc = subprocess.TimeoutExpired(
             cmd=["docker", "run"],
             timeout=5,
@@ -175,10 +187,7 @@ class DockerRunnerTests(unittest.TestCase):
                 args=args[0] if args else [], returncode=0, stdout="", stderr=""
             )
 
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch("sandbox.docker_runner.subprocess.run", side_effect=mock_run),
-        ):
+        with patch("sandbox.docker_runner.subprocess.run", side_effect=mock_run):
             out = self._run(
                 runner.execute(
                     sandbox_id="sb_w_timeout",
@@ -195,7 +204,7 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertGreaterEqual(call_count, 3)
 
     def test_execute_without_docker_cli_returns_error(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         with patch("sandbox.docker_runner.shutil.which", return_value=None):
             out = self._run(
                 runner.execute(
@@ -211,14 +220,14 @@ class DockerRunnerTests(unittest.TestCase):
         self.assertIn("docker CLI not found", out["error"])
 
     def test_start_without_docker_cli_raises(self) -> None:
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         with patch("sandbox.docker_runner.shutil.which", return_value=None):
             with self.assertRaises(RuntimeError):
                 self._run(runner.start("w_no_docker"))
 
     def test_execute_only_returns_new_or_modified_artifacts(self) -> None:
         """Artifacts from previous executions should not be re-reported."""
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         workspace = runner._workspace_dir("w_dedup")
         artifacts_dir = workspace / "artifacts"
         workspace.mkdir(parents=True, exist_ok=True)
@@ -227,10 +236,9 @@ class DockerRunnerTests(unittest.TestCase):
         # Pre-existing file from a previous execution
         preexisting = artifacts_dir / "old_chart.png"
         preexisting.write_bytes(b"old png")
-
-        import time
-
-        time.sleep(0.01)  # Ensure mtime difference
+        # Backdate instead of sleeping so the mtime comparison is unambiguous.
+        old_mtime = time.time() - 10
+        os.utime(preexisting, (old_mtime, old_mtime))
 
         def fake_run(*args, **kwargs):
             # Only create a new file during this execution
@@ -239,10 +247,7 @@ class DockerRunnerTests(unittest.TestCase):
                 args=args[0], returncode=0, stdout="ok", stderr=""
             )
 
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run),
-        ):
+        with patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run):
             out = self._run(
                 runner.execute(
                     sandbox_id="sb_w_dedup",
@@ -260,7 +265,7 @@ class DockerRunnerTests(unittest.TestCase):
 
     def test_execute_returns_modified_artifacts(self) -> None:
         """If a pre-existing file is modified, it should be returned."""
-        runner = DockerSandboxRunner()
+        runner = self._sandbox
         workspace = runner._workspace_dir("w_modified")
         artifacts_dir = workspace / "artifacts"
         workspace.mkdir(parents=True, exist_ok=True)
@@ -269,23 +274,18 @@ class DockerRunnerTests(unittest.TestCase):
         # Pre-existing file
         chart_file = artifacts_dir / "chart.png"
         chart_file.write_bytes(b"v1")
-
-        import time
-
-        time.sleep(0.01)  # Ensure mtime difference
+        # Backdated so the rewrite in fake_run counts as a modification.
+        old_mtime = time.time() - 10
+        os.utime(chart_file, (old_mtime, old_mtime))
 
         def fake_run(*args, **kwargs):
             # Modify the existing file
-            time.sleep(0.01)
             chart_file.write_bytes(b"v2 modified")
             return subprocess.CompletedProcess(
                 args=args[0], returncode=0, stdout="ok", stderr=""
             )
 
-        with (
-            patch("sandbox.docker_runner.shutil.which", return_value="/usr/bin/docker"),
-            patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run),
-        ):
+        with patch("sandbox.docker_runner.subprocess.run", side_effect=fake_run):
             out = self._run(
                 runner.execute(
                     sandbox_id="sb_w_modified",
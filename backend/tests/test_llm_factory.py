@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 from chat.adapters.openai_adapter import OpenAiAdapter
 from chat.adapters.openrouter_adapter import OpenRouterAdapter
-from chat.factory import build_llm_client
+from chat.factory import build_llm_client, override_llm_client
 
 
 class LlmFactoryTests(unittest.TestCase):
@@ -30,6 +30,13 @@ class LlmFactoryTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = build_llm_client(provider="gemini")
 
+    def test_override_short_circuits_provider_resolution(self) -> None:
+        sentinel = object()
+        with override_llm_client(sentinel):
+            self.assertIs(build_llm_client(provider="invalid"), sentinel)
+        client = build_llm_client(provider="openai", model="gpt-test", api_key="k")
+        self.assertIsInstance(client, OpenAiAdapter)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,11 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import main
 
+try:
+    import uvloop
+except ModuleNotFoundError:
+    uvloop = None
+
 
 class FakeSandboxManager:
     def __init__(self) -> None:
@@ -22,6 +27,8 @@ class FakeSandboxManager:
 
 
 class MainLifecycleTests(unittest.IsolatedAsyncioTestCase):
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
     async def test_startup_and_shutdown_manage_reaper_task(self) -> None:
         manager = FakeSandboxManager()
         old_interval = main.REAPER_INTERVAL_SECONDS
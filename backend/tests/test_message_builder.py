@@ -3,6 +3,9 @@ import unittest
 
 from chat.message_builder import build_llm_messages_from_events
 
+# Over the compiler's constant-folding size limit, so build it once here.
+_BIG_STDOUT = "x" * 8_000
+
 
 class MessageBuilderTests(unittest.TestCase):
     def test_includes_artifact_inventory_memory_message(self) -> None:
@@ -30,7 +33,7 @@ class MessageBuilderTests(unittest.TestCase):
                 "parent_event_id": "event_call_py_1",
                 "type": "tool_result_python",
                 "payload": {
-                    "stdout": "x" * 8_000,
+                    "stdout": _BIG_STDOUT,
                     "stderr": "",
                     "error": None,
                     "artifacts": [
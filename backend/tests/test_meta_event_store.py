@@ -9,6 +9,14 @@ import api.worldlines as worldlines
 
 
 class MetaEventStoreCharacterizationTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._runner = asyncio.Runner()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._runner.close()
+
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory()
         temp_root = Path(self.temp_dir.name)
@@ -21,7 +29,7 @@ class MetaEventStoreCharacterizationTests(unittest.TestCase):
         self.temp_dir.cleanup()
 
     def _run(self, coro):
-        return asyncio.run(coro)
+        return self._runner.run(coro)
 
     def _create_worldline(self) -> str:
         thread_id = self._run(
@@ -87,25 +95,21 @@ class MetaEventStoreCharacterizationTests(unittest.TestCase):
                 "SELECT head_event_id FROM worldlines WHERE id = ?",
                 (worldline_id,),
             ).fetchone()["head_event_id"]
-            reachable = {
-                row["id"]
+            parent_by_id = {
+                row["id"]: row["parent_event_id"]
                 for row in conn.execute(
-                    """
-                    WITH RECURSIVE chain AS (
-                        SELECT id, parent_event_id
-                        FROM events
-                        WHERE id = ?
-                        UNION ALL
-                        SELECT e.id, e.parent_event_id
-                        FROM events e
-                        JOIN chain ON chain.parent_event_id = e.id
-                    )
-                    SELECT id FROM chain
-                    """,
-                    (head_event_id,),
-                ).fetchall()
+                    "SELECT id, parent_event_id FROM events WHERE worldline_id = ?",
+                    (worldline_id,),
+                )
             }
 
+        # Walk parent pointers from the head; the chain stays in one worldline.
+        reachable: set[str] = set()
+        event_id = head_event_id
+        while event_id is not None:
+            reachable.add(event_id)
+            event_id = parent_by_id.get(event_id)
+
         self.assertEqual(len(children), 1)
         self.assertEqual(children[0]["id"], first_child_id)
         self.assertEqual(head_event_id, first_child_id)
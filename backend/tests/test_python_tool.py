@@ -1,5 +1,6 @@
 import asyncio
 import json
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
@@ -34,19 +35,35 @@ class FakeSandboxManager:
 
 
 class PythonToolTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Migrate a template once; each test starts from a copy of it.
+        cls._template_dir = tempfile.TemporaryDirectory()
+        meta.DB_DIR = Path(cls._template_dir.name)
+        meta.DB_PATH = meta.DB_DIR / "meta.db"
+        meta.init_meta_db()
+        cls._template_db = meta.DB_PATH
+        cls._runner = asyncio.Runner()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._runner.close()
+        cls._template_dir.cleanup()
+
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory()
         temp_root = Path(self.temp_dir.name)
 
         meta.DB_DIR = temp_root / "data"
         meta.DB_PATH = meta.DB_DIR / "meta.db"
-        meta.init_meta_db()
+        meta.DB_DIR.mkdir()
+        shutil.copyfile(self._template_db, meta.DB_PATH)
 
     def tearDown(self) -> None:
         self.temp_dir.cleanup()
 
     def _run(self, coro):
-        return asyncio.run(coro)
+        return self._runner.run(coro)
 
     def _create_thread(self, title: str = "python-tool-test-thread") -> str:
         response = self._run(
@@ -9,6 +9,7 @@ import api.threads as threads
 import api.worldlines as worldlines
 import duckdb
 import duckdb_manager
+from fastapi import HTTPException
 from worldline_service import BranchOptions, WorldlineService
 
 
@@ -393,6 +394,65 @@ class WorldlineServiceTests(unittest.TestCase):
 
         self.assertEqual(rows, [("root", 1)])
 
+    def test_branch_many_from_event_commits_all_or_nothing(self) -> None:
+        thread_id = self._create_thread()
+        source_worldline_id = self._create_worldline(thread_id)
+
+        with meta.get_conn() as conn:
+            anchor_event_id = meta.append_event_and_advance_head(
+                conn,
+                worldline_id=source_worldline_id,
+                expected_head_event_id=None,
+                event_type="assistant_message",
+                payload={"text": "anchor"},
+            )
+            conn.commit()
+
+        service = WorldlineService()
+        branches = service.branch_many_from_event(
+            [
+                BranchOptions(
+                    source_worldline_id=source_worldline_id,
+                    from_event_id=anchor_event_id,
+                    name=f"child-{idx}",
+                )
+                for idx in range(3)
+            ]
+        )
+        self.assertEqual(
+            [branch.name for branch in branches], ["child-0", "child-1", "child-2"]
+        )
+        worldline_dirs = set((meta.DB_DIR / "worldlines").iterdir())
+
+        with self.assertRaises(HTTPException) as ctx:
+            service.branch_many_from_event(
+                [
+                    BranchOptions(
+                        source_worldline_id=source_worldline_id,
+                        from_event_id=anchor_event_id,
+                        name="kept-out",
+                    ),
+                    BranchOptions(
+                        source_worldline_id=source_worldline_id,
+                        from_event_id="event_missing",
+                        name="broken",
+                    ),
+                ]
+            )
+        self.assertEqual(ctx.exception.status_code, 404)
+
+        with meta.get_conn() as conn:
+            names = [
+                row["name"]
+                for row in conn.execute(
+                    "SELECT name FROM worldlines"
+                    " WHERE parent_worldline_id = ? ORDER BY name",
+                    (source_worldline_id,),
+                )
+            ]
+        self.assertEqual(names, ["child-0", "child-1", "child-2"])
+        self.assertEqual(set((meta.DB_DIR / "worldlines").iterdir()), worldline_dirs)
+
 
 if __name__ == "__main__":
     unittest.main()
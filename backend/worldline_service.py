@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import shutil
+import sqlite3
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -116,130 +119,220 @@ class WorldlineService:
 
         return row is not None
 
-    def branch_from_event(self, options: BranchOptions) -> BranchResult:
-        created_event_ids: list[str] = []
+    def _load_branch_source(
+        self, conn: sqlite3.Connection, options: BranchOptions
+    ) -> sqlite3.Row:
+        source_worldline = conn.execute(
+            "SELECT id, thread_id, head_event_id FROM worldlines WHERE id = ?",
+            (options.source_worldline_id,),
+        ).fetchone()
+        if source_worldline is None:
+            raise HTTPException(status_code=404, detail="source worldline not found")
 
-        with get_conn() as conn:
-            source_worldline = conn.execute(
-                "SELECT id, thread_id, head_event_id FROM worldlines WHERE id = ?",
-                (options.source_worldline_id,),
-            ).fetchone()
-            if source_worldline is None:
-                raise HTTPException(
-                    status_code=404, detail="source worldline not found"
-                )
+        source_event = conn.execute(
+            "SELECT id, worldline_id FROM events WHERE id = ?",
+            (options.from_event_id,),
+        ).fetchone()
+        if source_event is None:
+            raise HTTPException(status_code=404, detail="from_event_id not found")
 
-            source_event = conn.execute(
-                "SELECT id, worldline_id FROM events WHERE id = ?",
-                (options.from_event_id,),
-            ).fetchone()
-            if source_event is None:
-                raise HTTPException(status_code=404, detail="from_event_id not found")
+        if source_event[
+            "worldline_id"
+        ] != options.source_worldline_id and not self._event_in_history(
+            conn,
+            head_event_id=source_worldline["head_event_id"],
+            event_id=options.from_event_id,
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="from_event_id does not belong to source worldline",
+            )
 
-            if source_event[
-                "worldline_id"
-            ] != options.source_worldline_id and not self._event_in_history(
-                conn,
-                head_event_id=source_worldline["head_event_id"],
-                event_id=options.from_event_id,
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail="from_event_id does not belong to source worldline",
-                )
+        return source_worldline
 
-            new_worldline_id = new_id("worldline")
-            branch_name = options.name or f"branch-{options.from_event_id[-6:]}"
+    def _copy_branch_state(
+        self,
+        conn: sqlite3.Connection,
+        options: BranchOptions,
+        *,
+        source_head_event_id: str | None,
+        new_worldline_id: str,
+    ) -> None:
+        source_state_path = self._resolve_branch_state_source_path(
+            conn,
+            source_worldline_id=options.source_worldline_id,
+            source_head_event_id=source_head_event_id,
+            from_event_id=options.from_event_id,
+        )
 
-            conn.execute(
-                """
-                INSERT INTO worldlines
-                (id, thread_id, parent_worldline_id, forked_from_event_id, head_event_id, name)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    new_worldline_id,
-                    source_worldline["thread_id"],
-                    options.source_worldline_id,
-                    options.from_event_id,
-                    None,
-                    branch_name,
-                ),
-            )
+        if source_state_path is None:
+            _ = ensure_worldline_db(new_worldline_id)
+        else:
+            _ = clone_worldline_db_from_file(source_state_path, new_worldline_id)
 
-            source_state_path = self._resolve_branch_state_source_path(
-                conn,
-                source_worldline_id=options.source_worldline_id,
-                source_head_event_id=source_worldline["head_event_id"],
-                from_event_id=options.from_event_id,
-            )
+        copy_external_sources_to_worldline(
+            options.source_worldline_id, new_worldline_id
+        )
 
-            if source_state_path is None:
-                _ = ensure_worldline_db(new_worldline_id)
-            else:
-                _ = clone_worldline_db_from_file(source_state_path, new_worldline_id)
+    def _insert_branch_rows(
+        self,
+        conn: sqlite3.Connection,
+        options: BranchOptions,
+        *,
+        thread_id: str,
+        new_worldline_id: str,
+        branch_name: str,
+    ) -> BranchResult:
+        created_event_ids: list[str] = []
 
-            copy_external_sources_to_worldline(
-                options.source_worldline_id, new_worldline_id
+        conn.execute(
+            """
+            INSERT INTO worldlines
+            (id, thread_id, parent_worldline_id, forked_from_event_id, head_event_id, name)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                new_worldline_id,
+                thread_id,
+                options.source_worldline_id,
+                options.from_event_id,
+                None,
+                branch_name,
+            ),
+        )
+
+        try:
+            worldline_created_event_id = append_event_and_advance_head(
+                conn,
+                worldline_id=new_worldline_id,
+                expected_head_event_id=None,
+                event_type="worldline_created",
+                parent_event_id=options.from_event_id,
+                payload={
+                    "new_worldline_id": new_worldline_id,
+                    "parent_worldline_id": options.source_worldline_id,
+                    "forked_from_event_id": options.from_event_id,
+                    "name": branch_name,
+                },
             )
+            created_event_ids.append(worldline_created_event_id)
 
-            try:
-                worldline_created_event_id = append_event_and_advance_head(
+            if options.append_events:
+                time_travel_event_id = append_event_and_advance_head(
                     conn,
                     worldline_id=new_worldline_id,
-                    expected_head_event_id=None,
-                    event_type="worldline_created",
-                    parent_event_id=options.from_event_id,
+                    expected_head_event_id=worldline_created_event_id,
+                    event_type="time_travel",
                     payload={
+                        "from_worldline_id": options.source_worldline_id,
+                        "from_event_id": options.from_event_id,
                         "new_worldline_id": new_worldline_id,
-                        "parent_worldline_id": options.source_worldline_id,
-                        "forked_from_event_id": options.from_event_id,
                         "name": branch_name,
                     },
                 )
-                created_event_ids.append(worldline_created_event_id)
+                created_event_ids.append(time_travel_event_id)
 
-                if options.append_events:
-                    time_travel_event_id = append_event_and_advance_head(
+                if options.carried_user_message:
+                    carried_user_event_id = append_event_and_advance_head(
                         conn,
                         worldline_id=new_worldline_id,
-                        expected_head_event_id=worldline_created_event_id,
-                        event_type="time_travel",
+                        expected_head_event_id=time_travel_event_id,
+                        event_type="user_message",
                         payload={
-                            "from_worldline_id": options.source_worldline_id,
-                            "from_event_id": options.from_event_id,
-                            "new_worldline_id": new_worldline_id,
-                            "name": branch_name,
+                            "text": options.carried_user_message,
+                            "carried_from_worldline_id": options.source_worldline_id,
                         },
                     )
-                    created_event_ids.append(time_travel_event_id)
-
-                    if options.carried_user_message:
-                        carried_user_event_id = append_event_and_advance_head(
-                            conn,
-                            worldline_id=new_worldline_id,
-                            expected_head_event_id=time_travel_event_id,
-                            event_type="user_message",
-                            payload={
-                                "text": options.carried_user_message,
-                                "carried_from_worldline_id": options.source_worldline_id,
-                            },
-                        )
-                        created_event_ids.append(carried_user_event_id)
-            except EventStoreConflictError as exc:
-                raise HTTPException(
-                    status_code=409,
-                    detail="worldline head moved during branch event creation",
-                ) from exc
-
-            conn.commit()
+                    created_event_ids.append(carried_user_event_id)
+        except EventStoreConflictError as exc:
+            raise HTTPException(
+                status_code=409,
+                detail="worldline head moved during branch event creation",
+            ) from exc
 
         return BranchResult(
             new_worldline_id=new_worldline_id,
-            thread_id=source_worldline["thread_id"],
+            thread_id=thread_id,
             source_worldline_id=options.source_worldline_id,
             from_event_id=options.from_event_id,
             name=branch_name,
             created_event_ids=tuple(created_event_ids),
             switched=options.append_events,
         )
+
+    def branch_from_event(self, options: BranchOptions) -> BranchResult:
+        with get_conn() as conn:
+            source_worldline = self._load_branch_source(conn, options)
+
+            new_worldline_id = new_id("worldline")
+            branch_name = options.name or f"branch-{options.from_event_id[-6:]}"
+
+            self._copy_branch_state(
+                conn,
+                options,
+                source_head_event_id=source_worldline["head_event_id"],
+                new_worldline_id=new_worldline_id,
+            )
+
+            result = self._insert_branch_rows(
+                conn,
+                options,
+                thread_id=source_worldline["thread_id"],
+                new_worldline_id=new_worldline_id,
+                branch_name=branch_name,
+            )
+
+            conn.commit()
+
+        return result
+
+    def branch_many_from_event(
+        self, options: Sequence[BranchOptions]
+    ) -> list[BranchResult]:
+        """
+        Create several branches and commit their rows in one transaction.
+
+        State files are copied before any row is written, so the write lock
+        is only held for the inserts. If any branch fails, nothing is
+        committed and the worldline directories already copied are removed.
+        """
+        planned: list[tuple[BranchOptions, str, str, str]] = []
+        try:
+            with get_conn() as conn:
+                for item in options:
+                    source_worldline = self._load_branch_source(conn, item)
+                    new_worldline_id = new_id("worldline")
+                    planned.append(
+                        (
+                            item,
+                            source_worldline["thread_id"],
+                            new_worldline_id,
+                            item.name or f"branch-{item.from_event_id[-6:]}",
+                        )
+                    )
+                    self._copy_branch_state(
+                        conn,
+                        item,
+                        source_head_event_id=source_worldline["head_event_id"],
+                        new_worldline_id=new_worldline_id,
+                    )
+
+                results = [
+                    self._insert_branch_rows(
+                        conn,
+                        item,
+                        thread_id=thread_id,
+                        new_worldline_id=new_worldline_id,
+                        branch_name=branch_name,
+                    )
+                    for item, thread_id, new_worldline_id, branch_name in planned
+                ]
+                conn.commit()
+        except BaseException:
+            for _, _, new_worldline_id, _ in planned:
+                shutil.rmtree(
+                    worldline_db_path(new_worldline_id).parent, ignore_errors=True
+                )
+            raise
+
+        return results